@@ -0,0 +1,7 @@
+"""
+Benchmark suite for the recommendation hot path and the O*NET ETL loaders.
+
+Run from the repository root:
+
+    python -m benchmarks.run --output bench.json --baseline benchmarks/baseline.json
+"""
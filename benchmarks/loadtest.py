@@ -0,0 +1,414 @@
+"""
+Load test: drive /submit, /results/{data_id}, /jobs/{soc_code} and /admin at
+a fixed concurrency, and report throughput, latency histograms, error rates
+and pool saturation.
+
+By default a local uvicorn is launched on a temporary SQLite database seeded
+with a synthetic catalog. `--database-url` points the launched server at
+another database, such as a local PostgreSQL with the O*NET data loaded.
+`--url` targets a server that is already running. While the test runs,
+/metrics is scraped for db_pool_checked_out, submit_in_flight and admission
+rejections. With several uvicorn workers, each scrape only sees the worker
+that answered it.
+
+    python -m benchmarks.loadtest --concurrency 32 --duration 30
+    python -m benchmarks.loadtest --database-url postgresql://postgres:pw@localhost/SurveyData --workers 4
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --mix submit=1 --rate-limit 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks.run import summarize
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MIX = "submit=60,results=20,jobs=15,admin=5"
+# Upper bounds (ms) of the latency histogram buckets; the last is open-ended
+HISTOGRAM_BOUNDS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+SCRAPED_GAUGES = ("db_pool_checked_out", "submit_in_flight")
+
+
+def _parse_mix(value: str):
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ("submit", "results", "jobs", "admin"):
+            raise argparse.ArgumentTypeError(f"unknown endpoint {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# ---------------------------------------------------------
+# LOCAL SERVER
+# ---------------------------------------------------------
+def seed_sqlite(database_url: str, size: int):
+    """Create the schema on a SQLite database and insert a synthetic catalog."""
+    # synthetic imports models -> database, which reads DATABASE_URL on import
+    os.environ["DATABASE_URL"] = database_url
+    from sqlalchemy import create_engine
+
+    from benchmarks.synthetic import SyntheticCatalog
+
+    engine = create_engine(database_url, connect_args={"check_same_thread": False})
+    SyntheticCatalog(size).seed(engine)
+    engine.dispose()
+
+
+def launch_server(database_url: str, port: int, workers: int, env_overrides: dict):
+    env = dict(os.environ, DATABASE_URL=database_url, **env_overrides)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=REPO_ROOT,
+        env=env,
+    )
+
+
+async def wait_ready(base_url: str, process=None, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url, timeout=2.0) as client:
+        while time.monotonic() < deadline:
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(f"Server exited with status {process.returncode}")
+            try:
+                if (await client.get("/metrics")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} not ready after {timeout:.0f}s")
+
+
+# ---------------------------------------------------------
+# METRICS SCRAPING
+# ---------------------------------------------------------
+def parse_metrics(text: str):
+    """Scraped gauges plus the total of http_rejected_requests_total, from Prometheus text."""
+    values = {name: 0.0 for name in SCRAPED_GAUGES}
+    values["rejected"] = 0.0
+    for line in text.splitlines():
+        if line.startswith("#") or not line.strip():
+            continue
+        name_labels, _, value = line.rpartition(" ")
+        name = name_labels.split("{", 1)[0]
+        if name in SCRAPED_GAUGES:
+            values[name] = float(value)
+        elif name == "http_rejected_requests_total":
+            values["rejected"] += float(value)
+    return values
+
+
+class Saturation:
+    """Gauge samples taken from /metrics while the load runs."""
+
+    def __init__(self):
+        self.samples = {name: [] for name in SCRAPED_GAUGES}
+        self.rejected_start = None
+        self.rejected_end = None
+        self.scrape_errors = 0
+
+    def add(self, values: dict):
+        for name in SCRAPED_GAUGES:
+            self.samples[name].append(values[name])
+        if self.rejected_start is None:
+            self.rejected_start = values["rejected"]
+        self.rejected_end = values["rejected"]
+
+    def report(self, pool_capacity: int = None):
+        report = {"scrapes": len(self.samples[SCRAPED_GAUGES[0]]), "scrape_errors": self.scrape_errors}
+        for name, samples in self.samples.items():
+            if samples:
+                report[name] = {"mean": round(sum(samples) / len(samples), 2), "max": max(samples)}
+        pool = self.samples["db_pool_checked_out"]
+        if pool and pool_capacity:
+            report["pool_capacity"] = pool_capacity
+            report["pool_saturated_fraction"] = round(
+                sum(1 for v in pool if v >= pool_capacity) / len(pool), 3
+            )
+        if self.rejected_start is not None:
+            report["rejections"] = int(self.rejected_end - self.rejected_start)
+        return report
+
+
+async def scrape_loop(client: httpx.AsyncClient, saturation: Saturation, interval: float, stop: asyncio.Event):
+    while not stop.is_set():
+        try:
+            response = await client.get("/metrics")
+            saturation.add(parse_metrics(response.text))
+        except httpx.HTTPError:
+            saturation.scrape_errors += 1
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+# ---------------------------------------------------------
+# LOAD GENERATION
+# ---------------------------------------------------------
+class EndpointStats:
+    def __init__(self):
+        self.latencies = []  # seconds, every completed request
+        self.statuses = {}
+        self.errors = 0  # transport errors and timeouts
+
+    def record(self, elapsed: float, status: int = None):
+        if status is None:
+            self.errors += 1
+            return
+        self.latencies.append(elapsed)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def report(self, seconds: float):
+        requests = len(self.latencies) + self.errors
+        failed = self.errors + sum(n for s, n in self.statuses.items() if s >= 400)
+        report = {
+            "requests": requests,
+            "throughput_rps": round(requests / seconds, 2) if seconds else None,
+            "statuses": {str(s): n for s, n in sorted(self.statuses.items())},
+            "transport_errors": self.errors,
+            "error_rate": round(failed / requests, 4) if requests else None,
+        }
+        if self.latencies:
+            report["latency"] = summarize(self.latencies)
+            report["histogram"] = histogram(self.latencies)
+        return report
+
+
+def histogram(latencies):
+    """{"<=1ms": n, ..., ">5000ms": n} over latencies in seconds."""
+    counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    for latency in latencies:
+        ms = latency * 1000.0
+        for i, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if ms <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f"<={b}ms" for b in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+    return dict(zip(labels, counts))
+
+
+class LoadState:
+    """Ids seen in /submit responses, for the read endpoints to request."""
+
+    def __init__(self):
+        self.data_ids = []
+        self.soc_codes = []
+        self.known_socs = set()
+
+    def remember(self, payload: dict):
+        self.data_ids.append(payload["data_id"])
+        for job in payload.get("top_jobs", []):
+            soc = job.get("soc_code")
+            if soc and soc not in self.known_socs:
+                self.known_socs.add(soc)
+                self.soc_codes.append(soc)
+
+
+async def user_loop(client, payloads, mix, stats, state, deadline, rng):
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    while time.monotonic() < deadline:
+        endpoint = rng.choices(names, weights)[0]
+        # The read endpoints need ids from earlier submissions
+        if endpoint == "results" and not state.data_ids:
+            endpoint = "submit"
+        if endpoint == "jobs" and not state.soc_codes:
+            endpoint = "submit"
+
+        if endpoint == "submit":
+            # Same body and header as static/survey.html posts
+            request = client.post(
+                "/submit?compact=true",
+                json=rng.choice(payloads),
+                headers={"Idempotency-Key": str(uuid.uuid4())},
+            )
+        elif endpoint == "results":
+            request = client.get(f"/results/{rng.choice(state.data_ids)}?compact=true")
+        elif endpoint == "jobs":
+            request = client.get(f"/jobs/{rng.choice(state.soc_codes)}")
+        else:
+            request = client.get("/admin")
+
+        start = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            stats[endpoint].record(time.perf_counter() - start)
+            continue
+        stats[endpoint].record(time.perf_counter() - start, response.status_code)
+        if endpoint == "submit" and response.status_code == 200:
+            state.remember(response.json())
+
+
+async def run_load(base_url: str, concurrency: int, duration: float, mix: dict, payloads,
+                   timeout: float, scrape_interval: float, seed: int):
+    stats = {name: EndpointStats() for name in mix}
+    stats.setdefault("submit", EndpointStats())
+    state = LoadState()
+    saturation = Saturation()
+    stop = asyncio.Event()
+
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        scraper = asyncio.create_task(scrape_loop(client, saturation, scrape_interval, stop))
+        started = time.monotonic()
+        deadline = started + duration
+        await asyncio.gather(*(
+            user_loop(client, payloads, mix, stats, state, deadline, random.Random(seed + i))
+            for i in range(concurrency)
+        ))
+        elapsed = time.monotonic() - started
+        stop.set()
+        await scraper
+    return stats, saturation, elapsed
+
+
+# ---------------------------------------------------------
+# REPORT
+# ---------------------------------------------------------
+def print_report(report: dict):
+    overall = report["overall"]
+    print(f"{overall['requests']} requests in {overall['seconds']}s = {overall['throughput_rps']} req/s, "
+          f"error rate {overall['error_rate']:.2%}")
+    for name, r in report["endpoints"].items():
+        if not r["requests"]:
+            continue
+        latency = r.get("latency", {})
+        print(f"\n{name:<8} {r['requests']} requests  {r['throughput_rps']} req/s  "
+              f"errors {r['error_rate']:.2%}  statuses {r['statuses']}")
+        if latency:
+            print(f"         p50={latency['p50_ms']:.1f}ms p95={latency['p95_ms']:.1f}ms "
+                  f"p99={latency['p99_ms']:.1f}ms max={latency['max_ms']:.1f}ms")
+            peak = max(r["histogram"].values()) or 1
+            for label, count in r["histogram"].items():
+                if count:
+                    print(f"         {label:>9} {count:>7} {'#' * max(1, round(40 * count / peak))}")
+    print(f"\nsaturation {json.dumps(report['saturation'])}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="target an already running server instead of launching one")
+    parser.add_argument("--database-url",
+                        help="database for the launched server (default: a temporary seeded SQLite file)")
+    parser.add_argument("--catalog-size", type=int, default=1000,
+                        help="synthetic jobs seeded into the temporary SQLite database")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the launched server")
+    parser.add_argument("--concurrency", type=int, default=16, help="simultaneous simulated users")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of load")
+    parser.add_argument("--mix", type=_parse_mix, default=_parse_mix(DEFAULT_MIX),
+                        help=f"endpoint weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--rate-limit", type=int, default=0,
+                        help="SUBMIT_RATE_LIMIT_PER_MINUTE for the launched server (default: 0 = off, "
+                             "since all simulated users share one IP)")
+    parser.add_argument("--max-concurrency", type=int,
+                        help="SUBMIT_MAX_CONCURRENCY for the launched server (default: its pool capacity)")
+    parser.add_argument("--pool-capacity", type=int,
+                        help="DB pool size + overflow, for the saturation figure (default: the "
+                             "DB_POOL_SIZE/DB_MAX_OVERFLOW settings)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--scrape-interval", type=float, default=0.5, help="seconds between /metrics scrapes")
+    parser.add_argument("--payloads", type=int, default=1000, help="distinct synthetic survey payloads")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = Path(tempfile.mkdtemp(prefix="grad-major-load-"))
+    process = None
+    try:
+        if args.url:
+            base_url = args.url.rstrip("/")
+            database_url = None
+        else:
+            database_url = args.database_url or f"sqlite:///{workdir / 'load.db'}"
+            if database_url.startswith("sqlite") and not args.database_url:
+                seed_sqlite(database_url, args.catalog_size)
+            port = _free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            env = {"SUBMIT_RATE_LIMIT_PER_MINUTE": str(args.rate_limit)}
+            if args.max_concurrency:
+                env["SUBMIT_MAX_CONCURRENCY"] = str(args.max_concurrency)
+            process = launch_server(database_url, port, args.workers, env)
+        asyncio.run(wait_ready(base_url, process))
+
+        # Imported late: database.py reads DATABASE_URL on import
+        os.environ.setdefault("DATABASE_URL", database_url or "sqlite://")
+        from benchmarks.synthetic import generate_payloads
+
+        payloads = generate_payloads(args.payloads, args.seed)
+        stats, saturation, elapsed = asyncio.run(run_load(
+            base_url, args.concurrency, args.duration, args.mix, payloads,
+            args.timeout, args.scrape_interval, args.seed,
+        ))
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    pool_capacity = args.pool_capacity or (
+        int(os.getenv("DB_POOL_SIZE", "5")) + int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    )
+    endpoints = {name: s.report(elapsed) for name, s in stats.items()}
+    requests = sum(r["requests"] for r in endpoints.values())
+    failed = sum(
+        s.errors + sum(n for code, n in s.statuses.items() if code >= 400) for s in stats.values()
+    )
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": args.url or ("sqlite (synthetic)" if not args.database_url else "local server"),
+            "args": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()
+                     if k != "database_url"},
+        },
+        "overall": {
+            "requests": requests,
+            "seconds": round(elapsed, 2),
+            "throughput_rps": round(requests / elapsed, 2) if elapsed else None,
+            "error_rate": round(failed / requests, 4) if requests else 0.0,
+        },
+        "endpoints": endpoints,
+        "saturation": saturation.report(pool_capacity),
+    }
+
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Run the benchmark scenarios, write p50/p95/p99 latencies as JSON and compare
+them against a stored baseline.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.2
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+
+Exits with status 1 when any scenario regresses past the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+# Local file locations, left out of the report's meta so a saved baseline
+# does not record where it happened to be written
+PATH_ARGS = ("output", "baseline", "save_baseline")
+
+
+def _int_list(value: str):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _percentile(sorted_samples, q: float):
+    """Linear-interpolated percentile of an already sorted list (q in 0–100)."""
+    if len(sorted_samples) == 1:
+        return sorted_samples[0]
+    pos = (len(sorted_samples) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_samples) - 1)
+    return sorted_samples[lo] + (sorted_samples[hi] - sorted_samples[lo]) * (pos - lo)
+
+
+def summarize(samples):
+    """Latency summary in milliseconds."""
+    ordered = sorted(s * 1000.0 for s in samples)
+    return {
+        "n": len(ordered),
+        "min_ms": round(ordered[0], 4),
+        "mean_ms": round(sum(ordered) / len(ordered), 4),
+        "p50_ms": round(_percentile(ordered, 50), 4),
+        "p95_ms": round(_percentile(ordered, 95), 4),
+        "p99_ms": round(_percentile(ordered, 99), 4),
+        "max_ms": round(ordered[-1], 4),
+    }
+
+
+def time_scenario(fn, repeat: int, warmup: int, max_seconds: float, min_samples: int = 3):
+    """
+    Call `fn` `warmup` times untimed, then up to `repeat` times timed. Stops
+    early once `max_seconds` have elapsed and at least `min_samples` exist.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    deadline = time.perf_counter() + max_seconds
+    while len(samples) < repeat:
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+        if len(samples) >= min_samples and time.perf_counter() > deadline:
+            break
+    return samples
+
+
+def compare(results: dict, baseline: dict, metric: str, threshold: float, min_delta_ms: float = 0.0):
+    """
+    Return a list of (name, baseline_ms, current_ms, ratio) for scenarios whose
+    `metric` grew by more than `threshold` (0.2 == 20%) over the baseline and
+    by more than `min_delta_ms` in absolute terms, so jitter on sub-millisecond
+    scenarios is not reported.
+    """
+    key = f"{metric}_ms"
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get(key):
+            continue
+        ratio = current[key] / previous[key]
+        if ratio > 1.0 + threshold and current[key] - previous[key] > min_delta_ms:
+            regressions.append((name, previous[key], current[key], ratio))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=_int_list, default=[100, 1000, 10000, 100000],
+                        help="catalog sizes for in-memory scoring (default: 100,1000,10000,100000)")
+    parser.add_argument("--db-sizes", type=_int_list, default=[100, 1000, 10000],
+                        help="catalog sizes for SQLite-backed scenarios (default: 100,1000,10000)")
+    parser.add_argument("--submit-size", type=int, default=1000,
+                        help="catalog size for the /submit end-to-end scenario (0 disables)")
+    parser.add_argument("--etl-db", action="store_true",
+                        help="also run the ETL loaders against their PostgreSQL database (DB_* settings in each loader)")
+    parser.add_argument("--only", default="",
+                        help="comma-separated substrings; run only scenarios whose name matches one")
+    parser.add_argument("--repeat", type=int, default=50, help="max timed runs per scenario")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed runs per scenario")
+    parser.add_argument("--max-seconds", type=float, default=10.0,
+                        help="time budget per scenario (at least 3 samples are always taken)")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", type=Path, help="write results as the new baseline")
+    parser.add_argument("--metric", choices=["p50", "p95", "p99"], default="p50",
+                        help="percentile used for the regression check (default: p50)")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed relative slowdown before failing (default: 0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.1,
+                        help="absolute slowdown a scenario must also exceed to fail (default: 0.1 ms)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = Path(tempfile.mkdtemp(prefix="grad-major-bench-"))
+
+    # Must be set before database.py is imported (via scenarios -> recommendation)
+    # so the app under test never touches the real database.
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'submit.db'}"
+    # A single TestClient would otherwise be throttled as one client IP
+    os.environ["SUBMIT_RATE_LIMIT_PER_MINUTE"] = "0"
+
+    try:
+        return _run(args, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _run(args, workdir: Path):
+    from benchmarks import scenarios
+
+    only = [s for s in args.only.split(",") if s]
+
+    def wanted(prefixes):
+        return not only or any(p in o or o in p for o in only for p in prefixes)
+
+    # (scenario name prefixes, builder) -- builders are only called when wanted,
+    # since seeding the larger catalogs takes a while.
+    builders = [
+        (["profile"], scenarios.profile_scenarios),
+        (["score"], lambda: scenarios.scoring_scenarios(args.sizes)),
+        (["aggregates", "catalog", "top_n"], lambda: scenarios.database_scenarios(args.db_sizes, workdir)),
+        (["submit"], lambda: scenarios.submit_scenarios(args.submit_size) if args.submit_size else []),
+        (["etl"], lambda: scenarios.etl_scenarios(with_db=args.etl_db)),
+    ]
+
+    results = {}
+    for prefixes, build in builders:
+        if not wanted(prefixes):
+            continue
+        for name, fn in build():
+            if only and not any(o in name for o in only):
+                continue
+            samples = time_scenario(fn, args.repeat, args.warmup, args.max_seconds)
+            results[name] = summarize(samples)
+            r = results[name]
+            print(f"{name:<28} n={r['n']:<4} p50={r['p50_ms']:>10.3f}ms "
+                  f"p95={r['p95_ms']:>10.3f}ms p99={r['p99_ms']:>10.3f}ms")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {k: v for k, v in vars(args).items() if k not in PATH_ARGS},
+        },
+        "results": results,
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare(results, baseline, args.metric, args.threshold, args.min_delta_ms)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: {args.metric} {before:.3f}ms -> {after:.3f}ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} and {args.min_delta_ms} ms on {args.metric}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
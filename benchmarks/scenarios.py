@@ -0,0 +1,160 @@
+"""
+Timed scenarios. Each builder returns a list of (name, callable) pairs;
+the runner calls each callable repeatedly and records wall-clock time.
+
+Import this module only after DATABASE_URL points at the benchmark database
+(benchmarks.run takes care of that), because main.py creates its tables on
+import.
+"""
+import itertools
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.synthetic import SyntheticCatalog, generate_payloads, generate_surveys
+import recommendation
+from recommendation import (
+    _estimate_user_profile,
+    generate_recommendation,
+    get_skill_aggregates,
+    invalidate_catalog,
+    load_catalog,
+)
+from scoring import Catalog, component_matrix, current_weights, top_indices, total_scores
+
+SURVEY_POOL_SIZE = 256
+
+
+def _cycle_surveys(seed: int = 0):
+    return itertools.cycle(generate_surveys(SURVEY_POOL_SIZE, seed))
+
+
+def _sqlite_engine(path: Path):
+    return create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+
+# ---------------------------------------------------------
+# IN-MEMORY SCORING
+# ---------------------------------------------------------
+def profile_scenarios():
+    surveys = _cycle_surveys()
+
+    def run():
+        _estimate_user_profile(next(surveys))
+
+    return [("profile", run)]
+
+
+def scoring_scenarios(sizes):
+    """Score every job in a compiled synthetic catalog, as generate_recommendation() does."""
+    scenarios = []
+    for size in sizes:
+        synthetic = SyntheticCatalog(size)
+        catalog = Catalog(synthetic.job_objects(), synthetic.skill_aggregates())
+        surveys = _cycle_surveys()
+
+        def run(catalog=catalog, surveys=surveys):
+            weights = current_weights()
+            profile = _estimate_user_profile(next(surveys))
+            top_indices(total_scores(component_matrix(catalog, profile, weights), weights), 5)
+
+        scenarios.append((f"score[{size}]", run))
+    return scenarios
+
+
+# ---------------------------------------------------------
+# DATABASE-BACKED (SQLITE)
+# ---------------------------------------------------------
+def database_scenarios(sizes, workdir: Path):
+    """
+    get_skill_aggregates(), a cold catalog load/compile and the full top-N
+    generate_recommendation() (on the cached catalog) against a SQLite
+    database seeded with the synthetic catalog.
+    """
+    scenarios = []
+    for size in sizes:
+        engine = _sqlite_engine(workdir / f"catalog_{size}.db")
+        SyntheticCatalog(size).seed(engine)
+        Session = sessionmaker(bind=engine)
+        surveys = _cycle_surveys()
+
+        def aggregates(Session=Session):
+            with Session() as db:
+                get_skill_aggregates(db)
+
+        def compile_catalog(Session=Session):
+            invalidate_catalog()
+            with Session() as db:
+                load_catalog(db)
+
+        def top_n(Session=Session, surveys=surveys):
+            recommendation._recommendation_cache.clear()  # time scoring, not cache hits
+            with Session() as db:
+                generate_recommendation(next(surveys), db, top_n=5)
+
+        scenarios.append((f"aggregates[{size}]", aggregates))
+        scenarios.append((f"catalog[{size}]", compile_catalog))
+        scenarios.append((f"top_n[{size}]", top_n))
+    return scenarios
+
+
+def submit_scenarios(size: int):
+    """POST /submit end-to-end through TestClient on the DATABASE_URL database."""
+    from fastapi.testclient import TestClient
+
+    from database import engine
+    from main import app
+
+    SyntheticCatalog(size).seed(engine)
+    client = TestClient(app)
+    payloads = itertools.cycle(generate_payloads(SURVEY_POOL_SIZE))
+
+    def run():
+        response = client.post("/submit", json=next(payloads))
+        response.raise_for_status()
+
+    return [(f"submit[{size}]", run)]
+
+
+# ---------------------------------------------------------
+# ETL LOADERS (REAL data/onet FILES)
+# ---------------------------------------------------------
+def etl_scenarios(with_db: bool = False):
+    """
+    Time the parse phase of each loader on the real O*NET files. Loaders whose
+    input files are missing are skipped. With `with_db`, also time the full
+    loader against the configured PostgreSQL database. load_jobs() appends
+    rather than replaces, so it is never run repeatedly.
+    """
+    import enrich_jobs_with_onet
+    import load_dwas
+    import load_education
+    import load_jobs_from_onet
+    import load_skills_knowledge
+
+    loaders = [
+        ("jobs", [load_jobs_from_onet.OCCUPATION_DATA_FILE],
+         load_jobs_from_onet.read_jobs, None),
+        ("job_zones", [enrich_jobs_with_onet.JOB_ZONES_FILE],
+         enrich_jobs_with_onet.read_job_zones, enrich_jobs_with_onet.load_job_zones),
+        ("interests", [enrich_jobs_with_onet.INTERESTS_FILE],
+         enrich_jobs_with_onet.read_interests, enrich_jobs_with_onet.load_interests),
+        ("skills", [load_skills_knowledge.SKILLS_FILE],
+         load_skills_knowledge.read_skills, load_skills_knowledge.load_skills),
+        ("knowledge", [load_skills_knowledge.KNOWLEDGE_FILE],
+         load_skills_knowledge.read_knowledge, load_skills_knowledge.load_knowledge),
+        ("dwas", [load_dwas.TASKS_DWAS_FILE, load_dwas.DWA_REF_FILE],
+         load_dwas.read_dwas, load_dwas.load_dwas),
+        ("education", [load_education.ETE_FILE],
+         load_education.read_education, load_education.load_education),
+    ]
+
+    scenarios = []
+    for name, files, read, load in loaders:
+        if not all(f.exists() for f in files):
+            continue
+        scenarios.append((f"etl_parse[{name}]", read))
+        if with_db and load is not None:
+            scenarios.append((f"etl_load[{name}]", load))
+    return scenarios
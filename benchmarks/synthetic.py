@@ -0,0 +1,221 @@
+"""
+Synthetic survey payloads and O*NET-shaped job catalogs for benchmarks.
+
+Everything is driven by a seeded random.Random so runs are reproducible.
+"""
+import random
+
+from sqlalchemy import text
+
+from models import Job
+from schemas import SurveySchema
+
+FOCUS_AREAS = [
+    "systems management",
+    "data analysis",
+    "technology design",
+    "cybersecurity",
+]
+
+# Element names chosen so the LIKE filters in get_skill_aggregates() match
+# roughly the same share of rows as the real Skills.txt / Knowledge.txt.
+SKILL_NAMES = [
+    "Mathematics",
+    "Critical Thinking",
+    "Complex Problem Solving",
+    "Operations Analysis",
+    "Systems Analysis",
+    "Active Listening",
+    "Speaking",
+    "Coordination",
+    "Social Perceptiveness",
+    "Programming",
+    "Writing",
+    "Judgment and Decision Making",
+]
+KNOWLEDGE_NAMES = [
+    "Computers and Electronics",
+    "Administration and Management",
+    "Administration",
+    "Economics and Accounting",
+    "Mathematics",
+    "English Language",
+    "Customer and Personal Service",
+]
+
+TITLE_WORDS = [
+    "Data", "Systems", "Security", "Network", "Database", "Software",
+    "Cloud", "Information", "Analyst", "Engineer", "Architect", "Manager",
+    "Developer", "Administrator", "Specialist", "Scientist",
+]
+
+
+# ---------------------------------------------------------
+# SURVEY PAYLOADS
+# ---------------------------------------------------------
+def random_survey_payload(rng: random.Random):
+    """Return a dict shaped like the JSON static/survey.html posts to /submit."""
+
+    def likert():
+        return rng.randint(1, 5)
+
+    return {
+        "q1": likert(),
+        "q2": likert(),
+        "q3": rng.choice(["structured", "open-ended", "mixed"]),
+        "q4": likert(),
+        "q5": rng.choice(["team", "independent", "both"]),
+        "q6": likert(),
+        "q7": rng.choice(FOCUS_AREAS),
+        "q8": likert(),
+        "q9": rng.random() < 0.7,
+        "q10": likert(),
+        "q11": likert(),
+        "q12": likert(),
+        "q13": likert(),
+        "q14": likert(),
+        "q15": likert(),
+        "r1": likert(),
+        "i1": likert(),
+        "a1": likert(),
+        "s1": likert(),
+        "e1": likert(),
+        "c1": likert(),
+    }
+
+
+def generate_payloads(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [random_survey_payload(rng) for _ in range(count)]
+
+
+def generate_surveys(count: int, seed: int = 0):
+    """Return `count` validated SurveySchema objects."""
+    return [SurveySchema(**p) for p in generate_payloads(count, seed)]
+
+
+# ---------------------------------------------------------
+# JOB CATALOG
+# ---------------------------------------------------------
+def _soc_code(i: int):
+    """Unique O*NET-SOC-looking code for the i-th synthetic job."""
+    major = 11 + i % 43
+    minor = 1000 + (i // 43) % 9000
+    suffix = i // (43 * 9000)
+    return f"{major:02d}-{minor:04d}.{suffix:02d}"
+
+
+class SyntheticCatalog:
+    """
+    In-memory stand-in for the jobs, job_skills and job_knowledge tables.
+
+    `jobs` holds dicts of Job column values; `skills` and `knowledge` hold
+    (soc_code, element_id, name, importance, level) tuples.
+    """
+
+    def __init__(self, size: int, seed: int = 0):
+        rng = random.Random(seed)
+        self.size = size
+        self.jobs = []
+        self.skills = []
+        self.knowledge = []
+
+        for i in range(size):
+            soc = _soc_code(i)
+            title = " ".join(rng.sample(TITLE_WORDS, 3))
+            self.jobs.append(
+                {
+                    "id": i + 1,
+                    "soc_code": soc,
+                    "title": title,
+                    "description": f"{title} synthetic occupation. " * 8,
+                    "focus_area": rng.choice(FOCUS_AREAS),
+                    "required_data_skill": rng.randint(2, 5),
+                    "required_tech_interest": rng.randint(2, 5),
+                    "required_communication": rng.randint(2, 5),
+                    "stability_level": rng.randint(3, 5),
+                    "salary_level": rng.randint(3, 5),
+                    "remote_possible": rng.random() < 0.8,
+                    "job_zone": rng.randint(2, 5),
+                    "riasec_r": round(rng.uniform(1, 7), 2),
+                    "riasec_i": round(rng.uniform(1, 7), 2),
+                    "riasec_a": round(rng.uniform(1, 7), 2),
+                    "riasec_s": round(rng.uniform(1, 7), 2),
+                    "riasec_e": round(rng.uniform(1, 7), 2),
+                    "riasec_c": round(rng.uniform(1, 7), 2),
+                }
+            )
+            zone = self.jobs[-1]["job_zone"]
+            self.jobs[-1]["education_level"] = round(min(12.0, zone * 1.6 + rng.uniform(-1, 1)), 3)
+            self.jobs[-1]["graduate_share"] = round(rng.uniform(0, 0.25) * max(zone - 3, 0), 4)
+            for n, name in enumerate(SKILL_NAMES):
+                self.skills.append(
+                    (soc, f"2.A.{n}", name, round(rng.uniform(1, 5), 2), round(rng.uniform(0, 7), 2))
+                )
+            for n, name in enumerate(KNOWLEDGE_NAMES):
+                self.knowledge.append(
+                    (soc, f"2.C.{n}", name, round(rng.uniform(1, 5), 2), round(rng.uniform(0, 7), 2))
+                )
+
+    def job_objects(self):
+        """Transient Job instances, as returned by db.query(Job).all()."""
+        return [Job(**row) for row in self.jobs]
+
+    def skill_aggregates(self):
+        """Same shape as recommendation.get_skill_aggregates(), computed in Python."""
+        buckets = {
+            "data_skills": (self.skills, ["analysis", "mathematics", "critical thinking", "complex problem solving"]),
+            "people_skills": (self.skills, ["active listening", "speaking", "coordination", "social"]),
+            "tech_knowledge": (self.knowledge, ["computer", "electronics"]),
+            "business_knowledge": (self.knowledge, ["administration", "management", "business"]),
+        }
+        sums = {}
+        for bucket, (rows, needles) in buckets.items():
+            for soc, _, name, importance, _ in rows:
+                lname = name.lower()
+                if any(n in lname for n in needles):
+                    total, count = sums.get((soc, bucket), (0.0, 0))
+                    sums[(soc, bucket)] = (total + importance, count + 1)
+
+        aggregates = {}
+        for (soc, bucket), (total, count) in sums.items():
+            aggregates.setdefault(soc, {})[bucket] = total / count
+        return aggregates
+
+    def seed(self, engine):
+        """
+        Create the schema on `engine` (normally SQLite) and insert the catalog.
+        job_skills / job_knowledge have no ORM models, so they are created here.
+        """
+        from database import Base
+
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            for table, name_col in (("job_skills", "skill_name"), ("job_knowledge", "knowledge_name")):
+                conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+                conn.execute(text(f"""
+                    CREATE TABLE {table} (
+                        id INTEGER PRIMARY KEY,
+                        soc_code VARCHAR,
+                        element_id VARCHAR,
+                        {name_col} VARCHAR,
+                        importance FLOAT,
+                        level FLOAT
+                    )
+                """))
+            conn.execute(Job.__table__.delete())
+            conn.execute(Job.__table__.insert(), self.jobs)
+            for table, name_col, rows in (
+                ("job_skills", "skill_name", self.skills),
+                ("job_knowledge", "knowledge_name", self.knowledge),
+            ):
+                conn.execute(
+                    text(f"""
+                        INSERT INTO {table} (soc_code, element_id, {name_col}, importance, level)
+                        VALUES (:soc, :eid, :name, :imp, :lvl)
+                    """),
+                    [
+                        {"soc": s, "eid": e, "name": n, "imp": imp, "lvl": lvl}
+                        for s, e, n, imp, lvl in rows
+                    ],
+                )
@@ -0,0 +1,152 @@
+"""
+Brotli/gzip response compression as a pure ASGI middleware.
+
+Brotli is used when the client accepts it and the `brotli` package is
+installed; otherwise gzip. Bodies below `minimum_size`, responses that
+already carry a Content-Encoding (e.g. precompressed static files) and
+already-compressed media types are passed through unchanged. Streaming
+responses are compressed chunk by chunk.
+"""
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+SKIP_CONTENT_TYPES = ("image/", "video/", "audio/", "font/woff", "application/zip",
+                      "application/gzip", "application/vnd.apache.parquet", "text/event-stream")
+
+
+def accepted_encodings(accept_encoding: str):
+    """Codings the client accepts (q > 0), lower-cased."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        key, _, value = params.replace(" ", "").partition("=")
+        if key == "q":
+            try:
+                if float(value) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding)
+    return accepted
+
+
+def choose_encoding(accept_encoding: str):
+    accepted = accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._c = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool):
+        return self._c.compress(data) + self._c.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._c = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool):
+        return self._c.process(data) + (self._c.finish() if final else self._c.flush())
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 500, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        stream = None  # compressor once compression has started
+        pending = []  # body chunks seen before deciding whether to compress
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, stream, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                passthrough = (
+                    "content-encoding" in headers
+                    or message["status"] in (204, 206, 304)
+                    or content_type.startswith(SKIP_CONTENT_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start_message = message  # held until we see the first body
+                return
+
+            if passthrough or start_message is None:
+                # e.g. http.response.debug, which Starlette sends before the start
+                await send(message)
+                return
+            if message["type"] != "http.response.body":
+                # e.g. http.response.pathsend: not compressible here
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if stream is None:
+                # Buffer until we know whether the body reaches minimum_size
+                # (responses passed through BaseHTTPMiddleware arrive in chunks)
+                pending.append(body)
+                pending_size = sum(len(b) for b in pending)
+                if more_body and pending_size < self.minimum_size:
+                    return
+                body = b"".join(pending)
+                pending.clear()
+
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if pending_size < self.minimum_size:
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body, "more_body": False})
+                    return
+                stream = (
+                    _BrotliStream(self.brotli_quality) if encoding == "br"
+                    else _GzipStream(self.gzip_level)
+                )
+                body = stream.compress(body, final=not more_body)
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                await send(start_message)
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            await send({
+                "type": "http.response.body",
+                "body": stream.compress(body, final=not more_body),
+                "more_body": more_body,
+            })
+
+        await self.app(scope, receive, send_compressed)
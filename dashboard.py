@@ -0,0 +1,220 @@
+"""
+Admin dashboard data: maintained survey counters, a cached job count and
+keyset-paginated survey history. Nothing here scans survey_responses on a
+page load.
+
+Backfill the counters for an existing database with:
+
+    python dashboard.py --rebuild
+"""
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import Job, SurveyCounter, SurveyResponse
+
+# Survey Q7 options (static/survey.html); anything else is counted as 'other'
+# so arbitrary client strings cannot grow the counters table.
+ROLE_CHOICES = ["systems management", "data analysis", "technology design", "cybersecurity"]
+RIASEC_FIELDS = ["r1", "i1", "a1", "s1", "e1", "c1"]
+
+DAILY_HISTORY_DAYS = 30
+JOB_COUNT_TTL_SECONDS = 300
+
+# Each submission increments one of this many rows per counter ('total',
+# 'total#1', ...), so concurrent commits rarely wait on the same row lock.
+# Reads sum the shards; run --rebuild after lowering it.
+COUNTER_SHARDS = max(1, int(os.getenv("SURVEY_COUNTER_SHARDS", "8")))
+
+_job_count = {"value": None, "expires": 0.0}
+_job_count_lock = threading.Lock()
+
+
+# ---------------------------------------------------------
+# COUNTER MAINTENANCE
+# ---------------------------------------------------------
+def _upsert(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f"Survey counters need ON CONFLICT support; unsupported dialect {dialect!r}")
+    return insert
+
+
+def _increment(db: Session, amounts: dict):
+    insert = _upsert(db)
+    # Sorted so concurrent transactions lock counter rows in the same order
+    rows = [{"name": name, "value": value} for name, value in sorted(amounts.items())]
+    stmt = insert(SurveyCounter).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SurveyCounter.name],
+        set_={"value": SurveyCounter.value + stmt.excluded.value},
+    )
+    db.execute(stmt)
+
+
+def _shard_name(name: str, shard: int):
+    return name if shard == 0 else f"{name}#{shard}"
+
+
+def _utc(db: Session, column):
+    """`column` as a UTC timestamp, so dates match record_submission's UTC buckets."""
+    if db.get_bind().dialect.name == "postgresql":
+        # date() of a timestamptz would use the session time zone
+        return func.timezone("UTC", column)
+    # SQLite's CURRENT_TIMESTAMP default is already UTC
+    return column
+
+
+def _role_key(q7: str):
+    return q7 if q7 in ROLE_CHOICES else "other"
+
+
+def record_submission(db: Session, entry: SurveyResponse, day: date = None):
+    """
+    Increment the dashboard counters for one new survey (caller commits).
+    Call it last before the commit: the counter rows stay locked until then.
+    """
+    day = day or datetime.now(timezone.utc).date()
+    amounts = {
+        "total": 1,
+        f"q7:{_role_key(entry.q7)}": 1,
+        f"day:{day.isoformat()}": 1,
+    }
+    for field in RIASEC_FIELDS:
+        amounts[f"riasec:{field[0]}"] = getattr(entry, field) or 0
+    shard = random.randrange(COUNTER_SHARDS)
+    _increment(db, {_shard_name(name, shard): value for name, value in amounts.items()})
+
+
+def rebuild_counters(db: Session):
+    """Recompute every counter from survey_responses into shard 0 (one-off backfill)."""
+    amounts = {}
+
+    riasec_sums = db.query(
+        func.count(SurveyResponse.id),
+        *[func.coalesce(func.sum(getattr(SurveyResponse, f)), 0) for f in RIASEC_FIELDS],
+    ).one()
+    amounts["total"] = riasec_sums[0]
+    for field, total in zip(RIASEC_FIELDS, riasec_sums[1:]):
+        amounts[f"riasec:{field[0]}"] = int(total)
+
+    for q7, count in db.query(SurveyResponse.q7, func.count()).group_by(SurveyResponse.q7):
+        key = f"q7:{_role_key(q7)}"
+        amounts[key] = amounts.get(key, 0) + count
+
+    day_col = func.date(_utc(db, SurveyResponse.submitted_at))
+    for day, count in db.query(day_col, func.count()).group_by(day_col):
+        if day is not None:
+            amounts[f"day:{str(day)[:10]}"] = count
+
+    db.query(SurveyCounter).delete()
+    db.add_all(SurveyCounter(name=name, value=value) for name, value in amounts.items())
+    db.commit()
+    return amounts
+
+
+# ---------------------------------------------------------
+# DASHBOARD READS
+# ---------------------------------------------------------
+def job_count(db: Session):
+    """Jobs only change through the ETL scripts, so cache the count briefly."""
+    now = time.monotonic()
+    with _job_count_lock:
+        if _job_count["value"] is not None and now < _job_count["expires"]:
+            return _job_count["value"]
+    value = db.query(func.count(Job.id)).scalar()
+    with _job_count_lock:
+        _job_count["value"] = value
+        _job_count["expires"] = now + JOB_COUNT_TTL_SECONDS
+    return value
+
+
+def dashboard_stats(db: Session, today: date = None):
+    """
+    Totals, Q7 role distribution, RIASEC means and submissions per day for
+    the last DAILY_HISTORY_DAYS days, all read from a bounded set of counters.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    days = [today - timedelta(days=n) for n in range(DAILY_HISTORY_DAYS)]
+    names = ["total"]
+    names += [f"q7:{role}" for role in ROLE_CHOICES + ["other"]]
+    names += [f"riasec:{field[0]}" for field in RIASEC_FIELDS]
+    names += [f"day:{d.isoformat()}" for d in days]
+
+    shard_names = [_shard_name(name, shard) for name in names for shard in range(COUNTER_SHARDS)]
+    counters = {}
+    for name, value in db.query(SurveyCounter.name, SurveyCounter.value).filter(
+        SurveyCounter.name.in_(shard_names)
+    ):
+        base = name.partition("#")[0]
+        counters[base] = counters.get(base, 0) + value
+    total = counters.get("total", 0)
+
+    roles = []
+    for role in ROLE_CHOICES + ["other"]:
+        count = counters.get(f"q7:{role}", 0)
+        roles.append({
+            "role": role,
+            "count": count,
+            "share": round(100.0 * count / total, 1) if total else 0.0,
+        })
+
+    riasec_means = {
+        field[0].upper(): round(counters.get(f"riasec:{field[0]}", 0) / total, 2) if total else None
+        for field in RIASEC_FIELDS
+    }
+
+    per_day = [{"day": d.isoformat(), "count": counters.get(f"day:{d.isoformat()}", 0)} for d in days]
+
+    return {
+        "total_surveys": total,
+        "role_distribution": roles,
+        "riasec_means": riasec_means,
+        "submissions_per_day": per_day,
+    }
+
+
+def encode_cursor(entry: SurveyResponse):
+    return str(entry.id)
+
+
+def decode_cursor(cursor: str):
+    # Older cursors looked like "<submitted_at>|<id>"
+    return int(cursor.rpartition("|")[2])
+
+
+def recent_surveys(db: Session, before: str = None, limit: int = 20):
+    """
+    One page of survey history, newest first, seeking past `before` (a cursor
+    from the previous page) on the primary key instead of OFFSET. Ids grow with
+    submitted_at, and comparing ids avoids timestamp round-trips (SQLite
+    stores whole seconds, which never compare equal to a bound microsecond
+    value). Returns (rows, next_cursor).
+    """
+    q = db.query(SurveyResponse).order_by(SurveyResponse.id.desc())
+    if before:
+        q = q.filter(SurveyResponse.id < decode_cursor(before))
+    rows = q.limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    if "--rebuild" not in sys.argv[1:]:
+        print(__doc__)
+        sys.exit(1)
+    with SessionLocal() as session:
+        counters = rebuild_counters(session)
+    print(f"Rebuilt {len(counters)} survey counters ({counters.get('total', 0)} surveys)")
@@ -23,28 +23,40 @@ def connect_db():
     )
 
 
+def read_job_zones():
+    """Parse Job Zones.txt into a list of (soc_code, job_zone) pairs."""
+    zones = []
+
+    # Job Zones.txt: O*NET-SOC Code, Job Zone, Date, Domain Source
+    with JOB_ZONES_FILE.open("r", encoding="utf-8") as f:
+        reader = csv.DictReader(f, delimiter="\t")
+        for row in reader:
+            soc = row["O*NET-SOC Code"].strip()
+            zone = int(row["Job Zone"])
+            zones.append((soc, zone))
+
+    return zones
+
+
 def load_job_zones():
     if not JOB_ZONES_FILE.exists():
         print(f"Missing {JOB_ZONES_FILE}")
         return
 
+    zones = read_job_zones()
+
     conn = connect_db()
     cur = conn.cursor()
 
     updated = 0
 
-    # Job Zones.txt: O*NET-SOC Code, Job Zone, Date, Domain Source
-    with JOB_ZONES_FILE.open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f, delimiter="\t")
-        for row in reader:
-            soc = row["O*NET-SOC Code"].strip()
-            zone = int(row["Job Zone"])
-            cur.execute(
-                "UPDATE jobs SET job_zone = %s WHERE soc_code = %s",
-                (zone, soc),
-            )
-            if cur.rowcount > 0:
-                updated += cur.rowcount
+    for soc, zone in zones:
+        cur.execute(
+            "UPDATE jobs SET job_zone = %s WHERE soc_code = %s",
+            (zone, soc),
+        )
+        if cur.rowcount > 0:
+            updated += cur.rowcount
 
     conn.commit()
     cur.close()
@@ -52,11 +64,8 @@ def load_job_zones():
     print(f"Updated job_zone for {updated} jobs")
 
 
-def load_interests():
-    if not INTERESTS_FILE.exists():
-        print(f"Missing {INTERESTS_FILE}")
-        return
-
+def read_interests():
+    """Parse Interests.txt into soc_code -> {'R': float, 'I': float, ...}."""
     riasec_map = {}
 
     # Interests.txt: O*NET-SOC Code, Element Name, Scale ID, Data Value, ...
@@ -86,6 +95,16 @@ def load_interests():
                 riasec_map[soc] = {}
             riasec_map[soc][key] = val
 
+    return riasec_map
+
+
+def load_interests():
+    if not INTERESTS_FILE.exists():
+        print(f"Missing {INTERESTS_FILE}")
+        return
+
+    riasec_map = read_interests()
+
     conn = connect_db()
     cur = conn.cursor()
     updated = 0
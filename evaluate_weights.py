@@ -0,0 +1,253 @@
+"""
+Offline A/B evaluation of scoring weights against stored surveys.
+
+Every row of survey_responses is read back into a SurveySchema and scored
+against the current job catalog twice: under the baseline weights (by
+default the ones in effect, see SCORING_WEIGHTS_PATH) and under each
+candidate weights file. The report gives, per candidate, the mean Spearman
+rank correlation with the baseline over all jobs, the mean top-N overlap,
+how often the top job is unchanged, and the throughput. Surveys are scored
+in vectorized batches across a process pool.
+
+    python evaluate_weights.py candidate.json
+    python evaluate_weights.py a.json b.json --baseline scoring_weights.json --top-n 10 --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from pydantic import ValidationError
+
+from models import SurveyResponse
+from recommendation import _estimate_user_profile, load_catalog
+from schemas import SurveySchema
+from scoring import ScoringWeights, batch_scores, current_weights
+
+STREAM_BATCH_SIZE = 5000
+# Profiles per scoring batch are sized so one (profiles x jobs) matrix holds
+# about this many cells
+BATCH_CELLS = 2_000_000
+
+
+# ---------------------------------------------------------
+# SURVEY SOURCE
+# ---------------------------------------------------------
+def iter_profiles(db, start=None, end=None, limit=None, skipped=None):
+    """
+    Yield the scoring profile of each stored survey, oldest first. Rows that
+    no longer validate as a SurveySchema are counted in `skipped[0]`.
+    """
+    fields = list(SurveySchema.model_fields)
+    q = db.query(*[getattr(SurveyResponse, f) for f in fields])
+    if start is not None:
+        q = q.filter(SurveyResponse.submitted_at >= start)
+    if end is not None:
+        q = q.filter(SurveyResponse.submitted_at < end)
+    q = q.order_by(SurveyResponse.id)
+    if limit:
+        q = q.limit(limit)
+
+    # yield_per streams through a server-side cursor on PostgreSQL
+    for row in q.yield_per(STREAM_BATCH_SIZE):
+        try:
+            data = SurveySchema(**dict(zip(fields, row)))
+        except ValidationError:
+            if skipped is not None:
+                skipped[0] += 1
+            continue
+        yield _estimate_user_profile(data)
+
+
+def _chunks(items, size: int):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ---------------------------------------------------------
+# COMPARISON
+# ---------------------------------------------------------
+def _ranks(scores):
+    """Rank of every job per row (0 = best), ties broken by catalog order as in top_indices()."""
+    order = np.argsort(-scores, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(scores.shape[1])[None, :], axis=1)
+    return order, ranks
+
+
+def compare_scores(baseline, candidate, top_n: int):
+    """
+    Per-batch sums for one candidate: Spearman correlation of the full
+    rankings, top-N overlap (fraction of shared jobs) and unchanged top job.
+    """
+    rows, jobs = baseline.shape
+    base_order, base_ranks = _ranks(baseline)
+    cand_order, cand_ranks = _ranks(candidate)
+
+    if jobs > 1:
+        d2 = ((base_ranks - cand_ranks).astype(float) ** 2).sum(axis=1)
+        spearman = 1 - 6 * d2 / (jobs * (jobs ** 2 - 1))
+    else:
+        spearman = np.ones(rows)
+
+    n = min(top_n, jobs)
+    in_base_top = base_ranks < n
+    overlap = np.take_along_axis(in_base_top, cand_order[:, :n], axis=1).sum(axis=1) / n
+
+    return {
+        "surveys": rows,
+        "spearman_sum": float(spearman.sum()),
+        "spearman_min": float(spearman.min()),
+        "overlap_sum": float(overlap.sum()),
+        "top1_same": int((base_order[:, 0] == cand_order[:, 0]).sum()),
+    }
+
+
+def _merge(total, part):
+    if total is None:
+        return dict(part)
+    for key, value in part.items():
+        total[key] = min(total[key], value) if key.endswith("_min") else total[key] + value
+    return total
+
+
+# ---------------------------------------------------------
+# WORKERS
+# ---------------------------------------------------------
+_worker_state = {}
+
+
+def _init_worker(catalog, weights_list, top_n):
+    _worker_state.update(catalog=catalog, weights_list=weights_list, top_n=top_n)
+
+
+def _evaluate_batch(profiles):
+    """Comparison sums of each candidate (weights_list[1:]) against weights_list[0]."""
+    scores = batch_scores(_worker_state["catalog"], profiles, _worker_state["weights_list"])
+    baseline, candidates = scores[0], scores[1:]
+    return [compare_scores(baseline, c, _worker_state["top_n"]) for c in candidates]
+
+
+def evaluate(catalog, weights_list, profiles, top_n: int = 5, workers: int = None,
+             batch_size: int = None):
+    """
+    Compare weights_list[1:] against weights_list[0] over `profiles` (any
+    iterable). Returns one summary dict per candidate and the elapsed seconds.
+    `workers=0` scores in this process.
+    """
+    batch_size = batch_size or max(1, BATCH_CELLS // max(len(catalog), 1))
+    workers = os.cpu_count() if workers is None else workers
+    totals = [None] * (len(weights_list) - 1)
+    started = time.perf_counter()
+
+    def collect(parts):
+        for i, part in enumerate(parts):
+            totals[i] = _merge(totals[i], part)
+
+    if workers == 0:
+        _init_worker(catalog, weights_list, top_n)
+        for chunk in _chunks(profiles, batch_size):
+            collect(_evaluate_batch(chunk))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(catalog, weights_list, top_n)) as pool:
+            # Keep a bounded number of batches in flight while streaming
+            pending = []
+            for chunk in _chunks(profiles, batch_size):
+                pending.append(pool.submit(_evaluate_batch, chunk))
+                if len(pending) >= 2 * workers:
+                    collect(pending.pop(0).result())
+            for future in pending:
+                collect(future.result())
+
+    elapsed = time.perf_counter() - started
+    summaries = []
+    for weights, total in zip(weights_list[1:], totals):
+        count = total["surveys"] if total else 0
+        summaries.append({
+            "weights_version": weights.version,
+            "surveys": count,
+            "spearman_mean": total["spearman_sum"] / count if count else None,
+            "spearman_min": total["spearman_min"] if count else None,
+            f"top{top_n}_overlap_mean": total["overlap_sum"] / count if count else None,
+            "top1_unchanged": total["top1_same"] / count if count else None,
+        })
+    return summaries, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("candidates", nargs="+", help="candidate weights files (scoring_weights.json format)")
+    parser.add_argument("--baseline", help="baseline weights file (default: the weights in effect)")
+    parser.add_argument("--top-n", type=int, default=5, help="top-N size for the overlap metric")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="scoring processes (default: CPU count; 0 scores in this process)")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help=f"surveys per scoring batch (default: about {BATCH_CELLS:,} cells / catalog size)")
+    parser.add_argument("--start", help="earliest submitted_at (inclusive), ISO date or datetime")
+    parser.add_argument("--end", help="latest submitted_at (exclusive), ISO date or datetime")
+    parser.add_argument("--limit", type=int, help="evaluate at most this many surveys")
+    parser.add_argument("--output", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    from database import SessionLocal
+    from export import parse_date
+
+    baseline = ScoringWeights.load(args.baseline) if args.baseline else current_weights()
+    weights_list = [baseline] + [ScoringWeights.load(path) for path in args.candidates]
+
+    db = SessionLocal()
+    try:
+        catalog = load_catalog(db)
+        if not len(catalog):
+            sys.exit("The jobs table is empty; run the ETL loaders first")
+        skipped = [0]
+        profiles = iter_profiles(db, parse_date(args.start), parse_date(args.end), args.limit, skipped)
+        summaries, elapsed = evaluate(
+            catalog, weights_list, profiles, args.top_n, args.workers, args.batch_size
+        )
+    finally:
+        db.close()
+
+    surveys = summaries[0]["surveys"]
+    report = {
+        "baseline": baseline.version,
+        "catalog_version": catalog.version,
+        "jobs": len(catalog),
+        "surveys": surveys,
+        "skipped": skipped[0],
+        "seconds": round(elapsed, 3),
+        "surveys_per_second": round(surveys / elapsed, 1) if elapsed else None,
+        "candidates": [
+            dict(summary, file=path) for path, summary in zip(args.candidates, summaries)
+        ],
+    }
+
+    print(f"baseline {report['baseline']}  catalog {report['catalog_version']} ({report['jobs']} jobs)")
+    print(f"{surveys} surveys ({report['skipped']} skipped) in {report['seconds']}s "
+          f"= {report['surveys_per_second']} surveys/s")
+    overlap_key = f"top{args.top_n}_overlap_mean"
+    for c in report["candidates"]:
+        if not c["surveys"]:
+            print(f"{c['file']}: no surveys")
+            continue
+        print(f"{c['file']} ({c['weights_version']}): spearman mean={c['spearman_mean']:.4f} "
+              f"min={c['spearman_min']:.4f}  top{args.top_n} overlap={c[overlap_key]:.3f}  "
+              f"top1 unchanged={c['top1_unchanged']:.3f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
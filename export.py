@@ -0,0 +1,230 @@
+"""
+Stream survey_responses (optionally with their stored recommendations) as
+CSV or Parquet. Rows are read with a server-side cursor in batches, so
+memory stays flat however many rows are exported.
+
+    python export.py --format csv --start 2025-01-01 --end 2025-02-01 --output surveys.csv
+    python export.py --format parquet --output surveys.parquet --no-recommendations
+"""
+import argparse
+import csv
+import importlib.util
+import io
+import sys
+from datetime import datetime
+
+from sqlalchemy import Boolean, Integer, TIMESTAMP
+from sqlalchemy.orm import Session
+
+from models import RecommendationResult, SurveyResponse
+
+BATCH_SIZE = 5000
+
+# Idempotency keys and payload hashes are request plumbing, not survey data
+INTERNAL_COLUMNS = ("idempotency_key", "payload_hash")
+SURVEY_COLUMNS = ["id", "submitted_at"] + [
+    c.name for c in SurveyResponse.__table__.columns
+    if c.name not in ("id", "submitted_at") + INTERNAL_COLUMNS
+]
+RECOMMENDATION_COLUMNS = ["recommended_major", "top_soc_codes", "top_scores", "catalog_version",
+                          "weights_version"]
+
+FORMATS = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def parse_date(value: str):
+    """ISO date or datetime; a bare date means midnight."""
+    return datetime.fromisoformat(value) if value else None
+
+
+def export_columns(include_recommendations: bool = True):
+    return SURVEY_COLUMNS + (RECOMMENDATION_COLUMNS if include_recommendations else [])
+
+
+# ---------------------------------------------------------
+# ROW SOURCE
+# ---------------------------------------------------------
+def iter_rows(db: Session, start: datetime = None, end: datetime = None,
+              include_recommendations: bool = True):
+    """
+    Yield one tuple per survey (in export_columns() order), submitted in
+    [start, end). SOC codes and scores of the stored top jobs are joined with ';'.
+    """
+    survey_cols = [getattr(SurveyResponse, name) for name in SURVEY_COLUMNS]
+    if include_recommendations:
+        q = db.query(
+            *survey_cols,
+            RecommendationResult.recommended_major,
+            RecommendationResult.top_jobs,
+            RecommendationResult.catalog_version,
+            RecommendationResult.weights_version,
+        ).outerjoin(RecommendationResult, RecommendationResult.survey_id == SurveyResponse.id)
+    else:
+        q = db.query(*survey_cols)
+
+    if start is not None:
+        q = q.filter(SurveyResponse.submitted_at >= start)
+    if end is not None:
+        q = q.filter(SurveyResponse.submitted_at < end)
+
+    # yield_per streams through a server-side cursor on PostgreSQL
+    q = q.order_by(SurveyResponse.id).yield_per(BATCH_SIZE)
+
+    n = len(SURVEY_COLUMNS)
+    for row in q:
+        if not include_recommendations:
+            yield tuple(row)
+            continue
+        major, top_jobs, catalog_version, weights_version = row[n:]
+        top_jobs = top_jobs or []
+        yield tuple(row[:n]) + (
+            major,
+            ";".join(j["soc_code"] for j in top_jobs),
+            ";".join(str(j["score"]) for j in top_jobs),
+            catalog_version,
+            weights_version,
+        )
+
+
+def _batches(rows, size: int = BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ---------------------------------------------------------
+# ENCODERS
+# ---------------------------------------------------------
+def csv_chunks(rows, columns):
+    """Yield CSV text in chunks of BATCH_SIZE rows, header first."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in _batches(rows):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to a generator."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def parquet_chunks(rows, columns):
+    """Yield a Parquet file one row group (BATCH_SIZE rows) at a time. Needs pyarrow."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa, columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    for batch in _batches(rows):
+        arrays = [pa.array(col, type=field.type) for col, field in zip(zip(*batch), schema)]
+        writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def _arrow_schema(pa, columns):
+    table_columns = SurveyResponse.__table__.columns
+    fields = []
+    for name in columns:
+        column_type = table_columns[name].type if name in table_columns else None
+        if isinstance(column_type, TIMESTAMP):
+            arrow_type = pa.timestamp("us", tz="UTC")
+        elif isinstance(column_type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column_type, Integer):
+            arrow_type = pa.int64()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def stream_export(session_factory, fmt: str, start: datetime = None, end: datetime = None,
+                  include_recommendations: bool = True):
+    """
+    Encoded export chunks. Opens its own session so it can outlive the
+    request that started it (StreamingResponse iterates after the handler returns).
+    """
+    columns = export_columns(include_recommendations)
+    encode = csv_chunks if fmt == "csv" else parquet_chunks
+    # Fail before the first byte rather than mid-stream
+    if fmt == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    def generate():
+        db = session_factory()
+        try:
+            rows = iter_rows(db, start, end, include_recommendations)
+            for chunk in encode(rows, columns):
+                yield chunk.encode() if isinstance(chunk, str) else chunk
+        finally:
+            db.close()
+
+    return generate()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("--start", help="earliest submitted_at (inclusive), ISO date or datetime")
+    parser.add_argument("--end", help="latest submitted_at (exclusive), ISO date or datetime")
+    parser.add_argument("--no-recommendations", action="store_true",
+                        help="omit the stored recommendation columns")
+    parser.add_argument("--output", help="output file (default: stdout for CSV)")
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet" and not args.output:
+        parser.error("--output is required for parquet")
+
+    from database import SessionLocal
+
+    chunks = stream_export(
+        SessionLocal, args.format, parse_date(args.start), parse_date(args.end),
+        include_recommendations=not args.no_recommendations,
+    )
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
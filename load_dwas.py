@@ -23,13 +23,15 @@ def connect_db():
     )
 
 
-def load_dwas():
+def read_dwas():
     """
     Approximate pipeline:
 
     - DWA Reference.txt: maps DWA IDs -> DWA Title
     - Tasks to DWAs.txt: links tasks -> DWA IDs (and sometimes SOC codes)
       In some versions, Tasks to DWAs.txt already has 'O*NET-SOC Code'.
+
+    Returns (soc_code, dwa_id, dwa_title, importance) tuples.
     """
 
     if not TASKS_DWAS_FILE.exists():
@@ -47,11 +49,7 @@ def load_dwas():
             dwa_title = row["DWA Title"].strip()
             dwa_title_map[dwa_id] = dwa_title
 
-    conn = connect_db()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM job_activities;")
-
-    count = 0
+    rows = []
 
     with TASKS_DWAS_FILE.open("r", encoding="utf-8") as f:
         reader = csv.DictReader(f, delimiter="\t")
@@ -68,14 +66,29 @@ def load_dwas():
             if not soc or not dwa_id or not dwa_title:
                 continue
 
-            cur.execute(
-                """
-                INSERT INTO job_activities (soc_code, dwa_id, dwa_title, importance)
-                VALUES (%s, %s, %s, %s)
-                """,
-                (soc, dwa_id, dwa_title, importance),
-            )
-            count += 1
+            rows.append((soc, dwa_id, dwa_title, importance))
+
+    return rows
+
+
+def load_dwas():
+    rows = read_dwas()
+
+    conn = connect_db()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM job_activities;")
+
+    count = 0
+
+    for row in rows:
+        cur.execute(
+            """
+            INSERT INTO job_activities (soc_code, dwa_id, dwa_title, importance)
+            VALUES (%s, %s, %s, %s)
+            """,
+            row,
+        )
+        count += 1
 
     conn.commit()
     cur.close()
@@ -0,0 +1,152 @@
+import csv
+import re
+import psycopg2
+from pathlib import Path
+
+from enrich_jobs_with_onet import JOB_ZONES_FILE, read_job_zones
+from scoring import MASTERS_CATEGORY
+
+DB_NAME = "SurveyData"
+DB_USER = "postgres"
+DB_PASSWORD = "Mustang"
+DB_HOST = "localhost"
+DB_PORT = "5432"
+
+ONET_DIR = Path("data/onet")
+ETE_FILE = ONET_DIR / "Education, Training, and Experience.txt"
+JOB_ZONE_REFERENCE_FILE = ONET_DIR / "Job Zone Reference.txt"
+
+# Required Level of Education (RL) categories: 6 = Bachelor's, 8 = Master's
+# (MASTERS_CATEGORY), 9 = Post-Master's certificate, 10 = First professional,
+# 11 = Doctoral, 12 = Post-doctoral
+
+# Degree named in a Job Zone Reference "Education" text -> RL category,
+# checked in order (highest first)
+REFERENCE_DEGREES = [
+    (r"graduate|master", 8),
+    (r"bachelor", 6),
+    (r"associate", 5),
+    (r"vocational", 3),
+    (r"high school", 2),
+]
+
+
+def connect_db():
+    return psycopg2.connect(
+        dbname=DB_NAME,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        host=DB_HOST,
+        port=DB_PORT,
+    )
+
+
+def read_ete():
+    """
+    Reduce the Required Level of Education distribution of each occupation in
+    Education, Training, and Experience.txt to
+    soc_code -> (education_level, graduate_share):
+      education_level: expected RL category (1-12)
+      graduate_share:  share of respondents requiring a master's or higher
+    """
+    # soc -> {category: percent}
+    distributions = {}
+
+    # ETE: O*NET-SOC Code, Element ID, Element Name, Scale ID, Category, Data Value, ...
+    with ETE_FILE.open("r", encoding="utf-8") as f:
+        reader = csv.DictReader(f, delimiter="\t")
+        for row in reader:
+            if row["Scale ID"].strip() != "RL":
+                continue
+            soc = row["O*NET-SOC Code"].strip()
+            category = int(row["Category"])
+            distributions.setdefault(soc, {})[category] = float(row["Data Value"])
+
+    features = {}
+    for soc, dist in distributions.items():
+        total = sum(dist.values())
+        if total <= 0:
+            continue
+        level = sum(c * p for c, p in dist.items()) / total
+        graduate = sum(p for c, p in dist.items() if c >= MASTERS_CATEGORY) / total
+        features[soc] = (round(level, 3), round(graduate, 4))
+    return features
+
+
+def read_job_zone_reference():
+    """Job Zone Reference.txt -> {job_zone: RL category of the degree its Education text names}."""
+    levels = {}
+    with JOB_ZONE_REFERENCE_FILE.open("r", encoding="utf-8") as f:
+        reader = csv.DictReader(f, delimiter="\t")
+        for row in reader:
+            text = row["Education"].lower()
+            for pattern, category in REFERENCE_DEGREES:
+                if re.search(pattern, text):
+                    levels[int(row["Job Zone"])] = category
+                    break
+    return levels
+
+
+def read_education():
+    """
+    soc_code -> (education_level, graduate_share) for every occupation with
+    ETE data or a Job Zone. Occupations without ETE data get the mean of
+    the ETE occupations in their Job Zone or, if there are none, the degree
+    named in Job Zone Reference.txt.
+    """
+    if not ETE_FILE.exists():
+        raise FileNotFoundError(f"Missing {ETE_FILE}")
+
+    features = read_ete()
+    zones = dict(read_job_zones()) if JOB_ZONES_FILE.exists() else {}
+
+    by_zone = {}
+    for soc, zone in zones.items():
+        if soc in features:
+            by_zone.setdefault(zone, []).append(features[soc])
+    zone_means = {
+        zone: (
+            round(sum(f[0] for f in rows) / len(rows), 3),
+            round(sum(f[1] for f in rows) / len(rows), 4),
+        )
+        for zone, rows in by_zone.items()
+    }
+    reference = read_job_zone_reference() if JOB_ZONE_REFERENCE_FILE.exists() else {}
+
+    for soc, zone in zones.items():
+        if soc in features:
+            continue
+        if zone in zone_means:
+            features[soc] = zone_means[zone]
+        elif zone in reference:
+            level = reference[zone]
+            features[soc] = (float(level), 1.0 if level >= MASTERS_CATEGORY else 0.0)
+    return features
+
+
+def load_education():
+    features = read_education()
+
+    conn = connect_db()
+    cur = conn.cursor()
+
+    cur.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS education_level FLOAT")
+    cur.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS graduate_share FLOAT")
+
+    updated = 0
+    for soc, (level, graduate) in features.items():
+        cur.execute(
+            "UPDATE jobs SET education_level = %s, graduate_share = %s WHERE soc_code = %s",
+            (level, graduate, soc),
+        )
+        if cur.rowcount > 0:
+            updated += cur.rowcount
+
+    conn.commit()
+    cur.close()
+    conn.close()
+    print(f"Updated education features for {updated} jobs")
+
+
+if __name__ == "__main__":
+    load_education()
@@ -107,14 +107,15 @@ def map_focus_area(title: str):
     return "systems management"
 
 
-def load_jobs():
+def read_jobs():
+    """
+    Parse Occupation Data.txt and return the MSIS-related rows as tuples
+    ready for the jobs INSERT.
+    """
     if not OCCUPATION_DATA_FILE.exists():
         raise FileNotFoundError(f"Could not find {OCCUPATION_DATA_FILE}")
 
-    conn = connect_db()
-    cur = conn.cursor()
-
-    inserted = 0
+    rows = []
 
     # Occupation Data.txt: tab-delimited with columns like:
     # O*NET-SOC Code, Title, Description, ...
@@ -133,22 +134,7 @@ def load_jobs():
             data_skill, tech_interest, comm, stability, salary, remote = rough_scores_from_title(
                 title
             )
-
-            cur.execute(
-                """
-                INSERT INTO jobs (
-                    soc_code,
-                    title,
-                    description,
-                    focus_area,
-                    required_data_skill,
-                    required_tech_interest,
-                    required_communication,
-                    stability_level,
-                    salary_level,
-                    remote_possible
-                ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                """,
+            rows.append(
                 (
                     soc_code,
                     title,
@@ -160,9 +146,39 @@ def load_jobs():
                     stability,
                     salary,
                     remote,
-                ),
+                )
             )
-            inserted += 1
+
+    return rows
+
+
+def load_jobs():
+    rows = read_jobs()
+
+    conn = connect_db()
+    cur = conn.cursor()
+
+    inserted = 0
+
+    for row in rows:
+        cur.execute(
+            """
+            INSERT INTO jobs (
+                soc_code,
+                title,
+                description,
+                focus_area,
+                required_data_skill,
+                required_tech_interest,
+                required_communication,
+                stability_level,
+                salary_level,
+                remote_possible
+            ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+            """,
+            row,
+        )
+        inserted += 1
 
     conn.commit()
     cur.close()
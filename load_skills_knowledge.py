@@ -23,13 +23,14 @@ def connect_db():
     )
 
 
-def load_skills():
+def read_skills():
     """
-    Load Skills.txt into job_skills.
+    Parse Skills.txt for job_skills.
     O*NET Skills.txt usually has columns like:
       'O*NET-SOC Code', 'Element ID', 'Element Name', 'Scale ID', 'Data Value', ...
     Scale ID: 'IM' = Importance, 'LV' = Level.
     We'll collapse IM/LV into one row per (soc_code, element_id).
+    Returns (soc_code, element_id) -> {name, importance, level}.
     """
     if not SKILLS_FILE.exists():
         raise FileNotFoundError(f"Missing {SKILLS_FILE}")
@@ -59,6 +60,12 @@ def load_skills():
             elif scale_id == "LV":  # Level
                 skill_map[key]["level"] = data_value
 
+    return skill_map
+
+
+def load_skills():
+    skill_map = read_skills()
+
     conn = connect_db()
     cur = conn.cursor()
 
@@ -88,10 +95,10 @@ def load_skills():
     print(f"Inserted {count} rows into job_skills")
 
 
-def load_knowledge():
+def read_knowledge():
     """
-    Load Knowledge.txt into job_knowledge.
-    Structure is similar to Skills.txt.
+    Parse Knowledge.txt for job_knowledge.
+    Structure (and return value) is similar to read_skills().
     """
     if not KNOWLEDGE_FILE.exists():
         raise FileNotFoundError(f"Missing {KNOWLEDGE_FILE}")
@@ -120,6 +127,12 @@ def load_knowledge():
             elif scale_id == "LV":
                 know_map[key]["level"] = data_value
 
+    return know_map
+
+
+def load_knowledge():
+    know_map = read_knowledge()
+
     conn = connect_db()
     cur = conn.cursor()
 
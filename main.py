@@ -1,23 +1,47 @@
-from fastapi import FastAPI, Depends, Request
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, HTMLResponse
+import os
+from typing import Optional
+
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
+import metrics
+from compression import CompressionMiddleware
+import rate_limit
+from dashboard import dashboard_stats, job_count, recent_surveys
 from database import Base, engine, SessionLocal
+from routes.admin import router as admin_router
+from routes.jobs import router as jobs_router
+from routes.results import router as results_router
 from routes.survey import router as survey_router
-from models import SurveyResponse, Job
+from static_assets import StaticAssets
 
 app = FastAPI(title="Graduate Major Recommendation API")
 
 # Create tables for SurveyResponse (jobs table already exists)
 Base.metadata.create_all(bind=engine)
 
+# Rate limiting and concurrency gate for /submit (inner), then per-stage
+# request timing (outer, so rejections are timed and counted too, under
+# their path rather than 'unmatched')
+app.middleware("http")(rate_limit.admission_middleware)
+app.middleware("http")(metrics.timing_middleware)
+metrics.REGISTRY.register(metrics.Gauge(
+    "db_pool_checked_out", "Database connections currently checked out.",
+    lambda: getattr(engine.pool, "checkedout", lambda: 0)(),
+))
+# Brotli (if installed) or gzip for responses above the size threshold
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "500")))
+
 # Routers
 app.include_router(survey_router)
+app.include_router(results_router)
+app.include_router(jobs_router)
+app.include_router(admin_router)
 
-# Static files (HTML, CSS, JS)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Static files (HTML, CSS, JS), loaded and precompressed once at startup
+static_assets = StaticAssets("static")
 
 # Templates (for admin dashboard)
 templates = Jinja2Templates(directory="templates")
@@ -32,27 +56,41 @@ def get_db():
 
 
 @app.get("/", include_in_schema=False)
-def read_root():
+def read_root(request: Request):
     # Serve the main survey UI
-    return FileResponse("static/survey.html")
+    return static_assets.response("survey.html", request)
+
+
+@app.api_route("/static/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+def static_file(path: str, request: Request):
+    return static_assets.response(path, request)
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/admin", response_class=HTMLResponse, include_in_schema=False)
-def admin_dashboard(request: Request, db: Session = Depends(get_db)):
-    total_surveys = db.query(SurveyResponse).count()
-    total_jobs = db.query(Job).count()
-    recent = (
-        db.query(SurveyResponse)
-        .order_by(SurveyResponse.submitted_at.desc())
-        .limit(20)
-        .all()
-    )
+def admin_dashboard(
+    request: Request, before: Optional[str] = None, db: Session = Depends(get_db)
+):
+    # Counters and a keyset page only -- constant work however many surveys exist
+    stats = dashboard_stats(db)
+    try:
+        recent, next_cursor = recent_surveys(db, before=before, limit=20)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid 'before' cursor")
     return templates.TemplateResponse(
+        request,
         "admin.html",
         {
-            "request": request,
-            "total_surveys": total_surveys,
-            "total_jobs": total_jobs,
+            "total_surveys": stats["total_surveys"],
+            "total_jobs": job_count(db),
+            "role_distribution": stats["role_distribution"],
+            "riasec_means": stats["riasec_means"],
+            "submissions_per_day": stats["submissions_per_day"],
             "recent_surveys": recent,
+            "next_cursor": next_cursor,
         },
     )
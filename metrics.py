@@ -0,0 +1,210 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+# Requests slower than this are logged with their per-stage breakdown
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# ---------------------------------------------------------
+# METRIC TYPES (PROMETHEUS TEXT FORMAT)
+# ---------------------------------------------------------
+def _format_labels(names, values, extra=""):
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for values, total in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, values)} {total}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose value is read from a callback at scrape time."""
+
+    def __init__(self, name: str, help_text: str, read):
+        self.name = name
+        self.help_text = help_text
+        self.read = read
+
+    def render(self):
+        return [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {self.read()}",
+        ]
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # label values -> [bucket counts..., sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for values, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    labels = _format_labels(self.label_names, values, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.label_names, values, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+                labels = _format_labels(self.label_names, values)
+                lines.append(f"{self.name}_sum{labels} {series[-2]}")
+                lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUESTS_TOTAL = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by route and status.", ("method", "path", "status")
+))
+REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "End-to-end request latency.", ("method", "path")
+))
+STAGE_DURATION = REGISTRY.register(Histogram(
+    "http_request_stage_duration_seconds", "Time spent in each request stage.", ("path", "stage")
+))
+SLOW_REQUESTS = REGISTRY.register(Counter(
+    "http_slow_requests_total", f"Requests slower than SLOW_REQUEST_MS ({SLOW_REQUEST_MS:g} ms).", ("path",)
+))
+
+
+# ---------------------------------------------------------
+# PER-REQUEST STAGE TIMING
+# ---------------------------------------------------------
+# List of (stage, seconds) for the current request. The middleware sets a
+# fresh list; sync endpoints run in a threadpool with a copy of the context,
+# so they append to the same list object.
+_request_stages: ContextVar = ContextVar("request_stages", default=None)
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block as one stage of the current request (no-op outside requests)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages = _request_stages.get()
+        if stages is not None:
+            stages.append((name, time.perf_counter() - start))
+
+
+def label_path(request, path: str):
+    """Label for a request answered before routing (e.g. an admission rejection)."""
+    request.scope["metrics_path"] = path
+
+
+def _route_path(request):
+    # Use the route template (/results/{data_id}) rather than the raw URL so
+    # label cardinality stays bounded.
+    route = request.scope.get("route")
+    if route is None:
+        return request.scope.get("metrics_path", "unmatched")
+    return getattr(route, "path", "unmatched")
+
+
+def _record(request, status_code: int, elapsed: float, stages):
+    path = _route_path(request)
+    REQUESTS_TOTAL.inc(request.method, path, str(status_code))
+    REQUEST_DURATION.observe(elapsed, request.method, path)
+    for name, seconds in stages:
+        STAGE_DURATION.observe(seconds, path, name)
+
+    if elapsed * 1000 >= SLOW_REQUEST_MS:
+        SLOW_REQUESTS.inc(path)
+        logger.warning(
+            "Slow request %s %s %d: %.1f ms (%s)",
+            request.method,
+            request.url.path,
+            status_code,
+            elapsed * 1000,
+            ", ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in stages) or "no stages",
+        )
+
+
+async def timing_middleware(request, call_next):
+    stages = []
+    token = _request_stages.set(stages)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        # Unhandled errors become a 500 further out; count them before re-raising
+        _record(request, 500, time.perf_counter() - start, stages)
+        raise
+    finally:
+        _request_stages.reset(token)
+    elapsed = time.perf_counter() - start
+
+    _record(request, response.status_code, elapsed, stages)
+
+    timings = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in stages]
+    timings.append(f"total;dur={elapsed * 1000:.2f}")
+    response.headers["Server-Timing"] = ", ".join(timings)
+    return response
+
+
+def render():
+    """Current metrics in Prometheus text exposition format."""
+    return REGISTRY.render()
@@ -1,4 +1,7 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, TIMESTAMP
+from sqlalchemy import (
+    Column, Integer, BigInteger, String, Boolean, Float, TIMESTAMP, Index, ForeignKey, JSON,
+)
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from database import Base
@@ -40,6 +43,54 @@ class SurveyResponse(Base):
 
     submitted_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
 
+    # Client-supplied Idempotency-Key; the unique constraint stops a retried
+    # POST from inserting twice even across workers
+    idempotency_key = Column(String(128), unique=True)
+    payload_hash = Column(String(64))
+
+    recommendation = relationship("RecommendationResult", uselist=False, back_populates="survey")
+
+    __table_args__ = (
+        # Keyset pagination of the admin history (ORDER BY submitted_at, id)
+        Index("ix_survey_responses_submitted_at_id", "submitted_at", "id"),
+    )
+
+
+class RecommendationResult(Base):
+    """Recommendations computed for one survey, stored with the survey insert."""
+
+    __tablename__ = "recommendation_results"
+
+    id = Column(Integer, primary_key=True, index=True)
+    survey_id = Column(Integer, ForeignKey("survey_responses.id"), unique=True, nullable=False)
+
+    recommended_major = Column(String)
+    # [{major, score}, ...] best first
+    major_ranking = Column(JSON)
+    # Ranked [{soc_code, title, score, components}, ...]; job details are looked
+    # up through /jobs when served (routes.results.with_job_details)
+    top_jobs = Column(JSON)
+    catalog_version = Column(String)
+    weights_version = Column(String)
+
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    survey = relationship("SurveyResponse", back_populates="recommendation")
+
+
+class SurveyCounter(Base):
+    """
+    Running totals for the admin dashboard, incremented in the same
+    transaction as each survey insert. Names look like 'total',
+    'q7:data analysis', 'day:2025-01-31' and 'riasec:r' (sum of r1), with
+    '#<n>' appended for shards after the first (dashboard.COUNTER_SHARDS).
+    """
+
+    __tablename__ = "survey_counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
 
 class Job(Base):
     __tablename__ = "jobs"
@@ -58,6 +109,11 @@ class Job(Base):
     remote_possible = Column(Boolean)
 
     job_zone = Column(Integer)
+    # From Education, Training, and Experience.txt (load_education.py):
+    # expected Required Level of Education category (1-12) and the share
+    # requiring a master's or higher
+    education_level = Column(Float)
+    graduate_share = Column(Float)
 
     # RIASEC interest scores from O*NET
     riasec_r = Column(Float)
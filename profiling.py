@@ -0,0 +1,155 @@
+import cProfile
+import hmac
+import marshal
+import os
+import pstats
+import random
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+# Fraction of requests to profile (0 disables sampling; admins can still
+# force a profile with the X-Profile header)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "1"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Only one cProfile profiler may be active per process (Python 3.12+), so
+# concurrent requests simply skip profiling while another one is recorded.
+_active = threading.Lock()
+_data_lock = threading.Lock()
+_profiles = {}  # endpoint -> {"requests": int, "stats": pstats.Stats, "stacks": Counter}
+
+
+def is_admin(request) -> bool:
+    token = request.headers.get("X-Admin-Token", "")
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+def _should_profile(request) -> bool:
+    if request.headers.get("X-Profile") == "1" and is_admin(request):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+# ---------------------------------------------------------
+# STATISTICAL STACK SAMPLER
+# ---------------------------------------------------------
+class _StackSampler(threading.Thread):
+    """
+    Periodically snapshot one thread's Python stack and count collapsed
+    stacks ("root;caller;callee"), the input format of flamegraph.pl and
+    speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _record(endpoint: str, profiler: cProfile.Profile, stacks: Counter):
+    stats = pstats.Stats(profiler)
+    with _data_lock:
+        entry = _profiles.get(endpoint)
+        if entry is None:
+            _profiles[endpoint] = {"requests": 1, "stats": stats, "stacks": stacks}
+        else:
+            entry["requests"] += 1
+            entry["stats"].add(stats)
+            entry["stacks"].update(stacks)
+
+
+@contextmanager
+def maybe_profile(request, endpoint: str):
+    """
+    Profile the enclosed block for a sampled fraction of requests (or when
+    an admin sends X-Profile: 1) and aggregate the result under `endpoint`.
+    Must run in the thread doing the work, i.e. inside the endpoint.
+    """
+    if not _should_profile(request) or not _active.acquire(blocking=False):
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    sampler = _StackSampler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL_MS / 1000.0)
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiling tool (e.g. a debugger) is already active
+        _active.release()
+        yield
+        return
+
+    sampler.start()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        sampler.stop()
+        _active.release()
+        _record(endpoint, profiler, sampler.stacks)
+
+
+# ---------------------------------------------------------
+# AGGREGATED RESULTS
+# ---------------------------------------------------------
+def summary(limit: int = 20):
+    """Per-endpoint request counts and the top functions by cumulative time."""
+    result = {}
+    with _data_lock:
+        for endpoint, entry in _profiles.items():
+            rows = []
+            for (filename, line, func), (cc, nc, tt, ct, _) in entry["stats"].stats.items():
+                rows.append({
+                    "function": f"{os.path.basename(filename)}:{line}({func})",
+                    "calls": nc,
+                    "total_time": round(tt, 6),
+                    "cumulative_time": round(ct, 6),
+                })
+            rows.sort(key=lambda r: r["cumulative_time"], reverse=True)
+            result[endpoint] = {
+                "requests": entry["requests"],
+                "samples": sum(entry["stacks"].values()),
+                "top_functions": rows[:limit],
+            }
+    return result
+
+
+def pstats_dump(endpoint: str):
+    """Aggregated stats in the binary format written by pstats.dump_stats()."""
+    with _data_lock:
+        entry = _profiles.get(endpoint)
+        return marshal.dumps(entry["stats"].stats) if entry else None
+
+
+def collapsed_stacks(endpoint: str):
+    """Aggregated samples as collapsed-stack lines ("a;b;c 42")."""
+    with _data_lock:
+        entry = _profiles.get(endpoint)
+        if entry is None:
+            return None
+        return "".join(f"{stack} {count}\n" for stack, count in entry["stacks"].most_common())
+
+
+def reset():
+    with _data_lock:
+        _profiles.clear()
@@ -0,0 +1,189 @@
+"""
+Admission control for expensive endpoints (/submit).
+
+1. A token bucket per client IP (in-process, or shared through Redis when
+   RATE_LIMIT_REDIS_URL is set) answers bursts beyond the allowance with 429.
+2. A global concurrency gate sized to the DB connection pool answers with
+   503 instead of letting requests queue on pool checkout.
+
+Both responses carry Retry-After.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi.responses import JSONResponse
+
+import metrics
+from database import POOL_CAPACITY
+
+logger = logging.getLogger(__name__)
+
+LIMITED_PATHS = {"/submit"}
+
+RATE_LIMIT_PER_MINUTE = float(os.getenv("SUBMIT_RATE_LIMIT_PER_MINUTE", "30"))
+RATE_LIMIT_BURST = float(os.getenv("SUBMIT_RATE_LIMIT_BURST", "10"))
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "")
+SUBMIT_MAX_CONCURRENCY = int(os.getenv("SUBMIT_MAX_CONCURRENCY", str(POOL_CAPACITY)))
+# Only enable behind a proxy that overwrites X-Forwarded-For
+TRUST_FORWARDED_FOR = os.getenv("TRUST_FORWARDED_FOR", "").lower() in ("1", "true", "yes")
+
+MAX_TRACKED_CLIENTS = 100_000
+
+
+# ---------------------------------------------------------
+# TOKEN BUCKETS
+# ---------------------------------------------------------
+class LocalTokenBuckets:
+    """Per-key token buckets in process memory (per worker)."""
+
+    def __init__(self, rate_per_second: float, burst: float, max_keys: int = MAX_TRACKED_CLIENTS):
+        self.rate = rate_per_second
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    async def take(self, key: str):
+        """Consume one token. Returns (allowed, retry_after_seconds)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            # Least recently seen clients are the ones with full buckets anyway
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / self.rate
+
+
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisTokenBuckets:
+    """
+    Same buckets kept in a Redis-compatible server, shared by all workers.
+    Needs the `redis` package. Fails open if the server is unreachable.
+    """
+
+    def __init__(self, url: str, rate_per_second: float, burst: float, prefix: str = "ratelimit:"):
+        import redis.asyncio
+
+        self.rate = rate_per_second
+        self.burst = burst
+        self.prefix = prefix
+        self._client = redis.asyncio.from_url(url)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def take(self, key: str):
+        try:
+            allowed, tokens = await self._script(
+                keys=[self.prefix + key], args=[self.rate, self.burst, time.time()]
+            )
+        except Exception:
+            logger.exception("Rate limit backend unavailable; allowing request")
+            return True, 0.0
+        if allowed:
+            return True, 0.0
+        return False, (1 - float(tokens)) / self.rate
+
+
+# ---------------------------------------------------------
+# CONCURRENCY GATE
+# ---------------------------------------------------------
+class ConcurrencyGate:
+    """Non-blocking counter: admit up to `limit` requests at once, reject the rest."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def try_enter(self) -> bool:
+        with self._lock:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            return True
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+
+def _make_buckets():
+    rate = RATE_LIMIT_PER_MINUTE / 60.0
+    if RATE_LIMIT_REDIS_URL:
+        return RedisTokenBuckets(RATE_LIMIT_REDIS_URL, rate, RATE_LIMIT_BURST)
+    return LocalTokenBuckets(rate, RATE_LIMIT_BURST)
+
+
+buckets = _make_buckets() if RATE_LIMIT_PER_MINUTE > 0 else None
+gate = ConcurrencyGate(SUBMIT_MAX_CONCURRENCY)
+
+REJECTED = metrics.REGISTRY.register(metrics.Counter(
+    "http_rejected_requests_total", "Requests turned away by admission control.", ("path", "reason")
+))
+metrics.REGISTRY.register(metrics.Gauge(
+    "submit_in_flight", "Requests currently admitted through the /submit gate.", lambda: gate.in_flight
+))
+
+
+def client_key(request):
+    if TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _reject(request, status_code: int, reason: str, retry_after: float):
+    path = request.url.path
+    REJECTED.inc(path, reason)
+    # Never routed, so label the request metrics with the limited path
+    metrics.label_path(request, path)
+    return JSONResponse(
+        {"detail": "Too many requests" if status_code == 429 else "Server busy, please retry"},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+async def admission_middleware(request, call_next):
+    path = request.url.path
+    if path not in LIMITED_PATHS or request.method != "POST":
+        return await call_next(request)
+
+    if buckets is not None:
+        allowed, retry_after = await buckets.take(client_key(request))
+        if not allowed:
+            return _reject(request, 429, "rate_limited", retry_after)
+
+    if not gate.try_enter():
+        return _reject(request, 503, "overloaded", 1)
+    try:
+        return await call_next(request)
+    finally:
+        gate.leave()
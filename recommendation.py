@@ -1,9 +1,32 @@
-import math
+import os
+import threading
+
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from cache import LRUCache, TTLCache
+from metrics import stage
 from models import Job
 from schemas import SurveySchema
+from scoring import (
+    Catalog,
+    component_matrix,
+    current_weights,
+    explain,
+    load_majors,
+    major_ranking,
+    top_indices,
+    total_scores,
+)
+
+# database URL -> compiled Catalog
+CATALOG_TTL_SECONDS = float(os.getenv("CATALOG_TTL_SECONDS", "300"))
+_catalog_cache = TTLCache(8, CATALOG_TTL_SECONDS)
+_catalog_lock = threading.Lock()
+
+# (weights version, catalog and majors versions, top_n, profile) -> recommendation;
+# entries are shared, so callers treat them as read-only
+_recommendation_cache = LRUCache(int(os.getenv("RECOMMENDATION_CACHE_SIZE", "10000")))
 
 
 # ---------------------------------------------------------
@@ -71,24 +94,6 @@ def _estimate_user_profile(data: SurveySchema):
     }
 
 
-# ---------------------------------------------------------
-# VECTOR SIMILARITY (RIASEC)
-# ---------------------------------------------------------
-def _cosine_similarity(v1, v2):
-    """Return cosine similarity between two vectors."""
-    if any(x is None for x in v1) or any(x is None for x in v2):
-        return 0.0
-
-    dot = sum(a * b for a, b in zip(v1, v2))
-    mag1 = math.sqrt(sum(a * a for a in v1))
-    mag2 = math.sqrt(sum(b * b for b in v2))
-
-    if mag1 == 0 or mag2 == 0:
-        return 0.0
-
-    return dot / (mag1 * mag2)
-
-
 # ---------------------------------------------------------
 # LOAD O*NET SKILL/KNOWLEDGE AGGREGATES
 # ---------------------------------------------------------
@@ -161,141 +166,90 @@ def get_skill_aggregates(db: Session):
 
 
 # ---------------------------------------------------------
-# SCORING A JOB AGAINST A USER PROFILE
+# COMPILED CATALOG
 # ---------------------------------------------------------
-def _score_job_for_user(job: Job, profile: dict, skill_aggs: dict):
+def load_catalog(db: Session):
     """
-    Higher score = better fit.
-    Uses a positive baseline, reduced penalties, and
-    combined RIASEC matching (estimated + explicit).
+    Jobs and skill aggregates of `db`'s database, with the majors config,
+    compiled for scoring and shared across requests for CATALOG_TTL_SECONDS
+    (the catalog only changes when the ETL scripts run). Empty catalogs are
+    not cached.
     """
-
-    score = 10.0  # positive baseline
-
-    # 1) Data / Tech / Communication fit
-    score -= abs((job.required_data_skill or 3) - profile["data_pref"]) * 0.5
-    score -= abs((job.required_tech_interest or 3) - profile["tech_interest"]) * 0.5
-    score -= abs((job.required_communication or 3) - profile["comm"]) * 0.5
-
-    # 2) Salary & stability
-    score -= abs((job.stability_level or 3) - profile["stability"]) * 0.4
-    score -= abs((job.salary_level or 3) - profile["salary"]) * 0.4
-
-    # 3) Remote preference
-    if profile["remote"] and job.remote_possible:
-        score += 2.5
-
-    # 4) Role match bonus
-    if profile["focus_pref"] and job.focus_area:
-        if profile["focus_pref"].lower() == (job.focus_area or "").lower():
-            score += 3.5
-
-    # 5) Combined RIASEC similarity
-    riasec_est = profile["riasec_estimated"]
-    riasec_custom = profile["riasec_custom"]
-
-    combined_user_riasec = tuple(
-        (riasec_est[i] * 0.6) + (riasec_custom[i] * 1.0)
-        for i in range(6)
-    )
-
-    job_riasec = (
-        job.riasec_r or 3,
-        job.riasec_i or 3,
-        job.riasec_a or 3,
-        job.riasec_s or 3,
-        job.riasec_e or 3,
-        job.riasec_c or 3,
-    )
-
-    sim = _cosine_similarity(combined_user_riasec, job_riasec)
-    score += sim * 8  # higher weight because interests are strong drivers
-
-    # 6) Skills and knowledge aggregates
-    job_features = skill_aggs.get(job.soc_code, {})
-
-    def norm(x):
-        return (x or 0) / 20.0  # approximate 0–100 → 0–5
-
-    data_skill_norm = norm(job_features.get("data_skills"))
-    people_skill_norm = norm(job_features.get("people_skills"))
-    tech_knowledge_norm = norm(job_features.get("tech_knowledge"))
-    business_knowledge_norm = norm(job_features.get("business_knowledge"))
-
-    # Reward similarity (5 - abs(diff))
-    score += (5 - abs(data_skill_norm - profile["data_pref"]))
-    score += (5 - abs(people_skill_norm - profile["comm"]))
-    score += (5 - abs(tech_knowledge_norm - profile["tech_interest"]))
-    score += (5 - abs(business_knowledge_norm - profile["stability"]))
-
-    # 7) Prefer master's-level jobs (Job Zone ≥ 4)
-    if job.job_zone and job.job_zone >= 4:
-        score += 1
-
-    return score
-
-
-# ---------------------------------------------------------
-# MAP SURVEY ROLE PREFERENCE → MAJOR
-# ---------------------------------------------------------
-def _map_focus_to_major(focus_pref: str):
-    if focus_pref == "data analysis":
-        return "MS in Data Analytics"
-    if focus_pref == "cybersecurity":
-        return "MS in Cybersecurity"
-    if focus_pref == "technology design":
-        return "MS in Software Engineering / IT"
-    return "MS in Information Systems"
+    key = str(db.get_bind().url)
+    catalog = _catalog_cache.get(key)
+    if catalog is not None:
+        return catalog
+    with _catalog_lock:
+        catalog = _catalog_cache.get(key)
+        if catalog is None:
+            with stage("jobs_query"):
+                jobs = db.query(Job).order_by(Job.id).all()
+            with stage("skill_aggregates"):
+                skill_aggs = get_skill_aggregates(db) if jobs else {}
+            catalog = Catalog(jobs, skill_aggs, load_majors())
+            if len(catalog):
+                _catalog_cache.put(key, catalog)
+    return catalog
+
+
+def invalidate_catalog():
+    """Drop compiled catalogs so the next request reloads them."""
+    _catalog_cache.clear()
 
 
 # ---------------------------------------------------------
 # MAIN ENTRYPOINT: GENERATE RECOMMENDATIONS
 # ---------------------------------------------------------
 def generate_recommendation(data: SurveySchema, db: Session, top_n: int = 5):
-    """Compute user's recommended graduate major and top N job matches."""
+    """
+    Compute user's top N job matches and the graduate majors ranked by the
+    mean of their best job scores; the recommended major is the first. Each
+    top job carries its per-component score breakdown under "components".
+    Surveys with the same profile, scored under the same weights and catalog,
+    are answered from cache.
+    """
 
     profile = _estimate_user_profile(data)
-    jobs = db.query(Job).all()
-    if not jobs:
+    weights = current_weights()
+    catalog = load_catalog(db)
+    if not len(catalog):
         return {
-            "recommended_major": "MS in Information Systems",
+            "recommended_major": catalog.default_major,
+            "major_ranking": [],
             "top_jobs": [],
+            "catalog_version": catalog.version,
+            "weights_version": weights.version,
         }
 
-    # Load skills and knowledge aggregates
-    skill_aggs = get_skill_aggregates(db)
-
-    # Score each job
-    scored = []
-    for job in jobs:
-        s = _score_job_for_user(job, profile, skill_aggs)
-        scored.append((s, job))
-
-    # Deduplicate by SOC code
-    unique = {}
-    for s, j in scored:
-        if j.soc_code not in unique:
-            unique[j.soc_code] = (s, j)
-
-    scored = list(unique.values())
-    scored.sort(key=lambda x: x[0], reverse=True)
-    top = scored[:top_n]
+    key = (
+        weights.version, catalog.version, catalog.majors_version, top_n,
+        tuple(sorted(profile.items())),
+    )
+    cached = _recommendation_cache.get(key)
+    if cached is not None:
+        return cached
 
-    major = _map_focus_to_major(profile["focus_pref"])
+    with stage("scoring"):
+        components = component_matrix(catalog, profile, weights)
+        scores = total_scores(components, weights)
+        top = top_indices(scores, top_n)
+        majors = major_ranking(catalog, scores)
 
     top_jobs = [
         {
-            "title": j.title,
-            "soc_code": j.soc_code,
-            "score": round(float(s), 3),
-            "focus_area": j.focus_area,
-            "description": j.description,
-            "job_zone": j.job_zone,
+            **catalog.jobs[i],
+            "score": round(float(scores[i]), 3),
+            "components": explain(components[i], weights),
         }
-        for s, j in top
+        for i in top
     ]
 
-    return {
-        "recommended_major": major,
+    rec = {
+        "recommended_major": majors[0]["major"] if majors else catalog.default_major,
+        "major_ranking": majors,
         "top_jobs": top_jobs,
+        "catalog_version": catalog.version,
+        "weights_version": weights.version,
     }
+    _recommendation_cache.put(key, rec)
+    return rec
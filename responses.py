@@ -0,0 +1,61 @@
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+# Fields of each top_jobs entry, and the subset returned by compact=true
+JOB_FIELDS = ("soc_code", "title", "score", "focus_area", "description", "job_zone")
+COMPACT_JOB_FIELDS = ("soc_code", "title", "score")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when it is installed. Endpoints return
+    it directly with plain dict/list/str/number content, which also skips
+    FastAPI's jsonable_encoder pass.
+    """
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
+
+
+def parse_job_fields(compact: bool = False, fields: Optional[str] = None):
+    """
+    Resolve the ?compact= / ?fields= query options to a tuple of job fields,
+    or None for the full entries.
+    """
+    if fields:
+        selected = tuple(f.strip() for f in fields.split(",") if f.strip())
+        unknown = [f for f in selected if f not in JOB_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields {unknown}; choose from {list(JOB_FIELDS)}",
+            )
+        return selected
+    return COMPACT_JOB_FIELDS if compact else None
+
+
+def project_jobs(payload: dict, job_fields, explain: bool = False):
+    """
+    Copy of a response payload with top_jobs reduced to `job_fields` (all of
+    JOB_FIELDS for None). Stored score breakdowns ("components") are kept
+    only with `explain`.
+    """
+    job_fields = job_fields or JOB_FIELDS
+    projected = dict(payload)
+    top_jobs = []
+    for job in payload["top_jobs"]:
+        entry = {f: job.get(f) for f in job_fields}
+        if explain and "components" in job:
+            entry["components"] = job["components"]
+        top_jobs.append(entry)
+    projected["top_jobs"] = top_jobs
+    return projected
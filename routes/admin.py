@@ -0,0 +1,76 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+
+import export
+import profiling
+from database import SessionLocal
+
+router = APIRouter(prefix="/admin", include_in_schema=False)
+
+
+def require_admin_token(request: Request):
+    # Exports carry every survey answer and profiles carry server paths, so
+    # these routes fail closed without ADMIN_TOKEN
+    if not profiling.is_admin(request):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+@router.get("/profiles", dependencies=[Depends(require_admin_token)])
+def list_profiles():
+    return profiling.summary()
+
+
+@router.get("/profiles/{endpoint}/pstats", dependencies=[Depends(require_admin_token)])
+def download_pstats(endpoint: str):
+    data = profiling.pstats_dump(endpoint)
+    if data is None:
+        raise HTTPException(status_code=404, detail="No profiles recorded for this endpoint")
+    return Response(
+        data,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{endpoint}.pstats"'},
+    )
+
+
+@router.get("/profiles/{endpoint}/flamegraph", dependencies=[Depends(require_admin_token)])
+def download_flamegraph(endpoint: str):
+    data = profiling.collapsed_stacks(endpoint)
+    if data is None:
+        raise HTTPException(status_code=404, detail="No profiles recorded for this endpoint")
+    return PlainTextResponse(
+        data,
+        headers={"Content-Disposition": f'attachment; filename="{endpoint}.folded"'},
+    )
+
+
+@router.delete("/profiles", dependencies=[Depends(require_admin_token)])
+def reset_profiles():
+    profiling.reset()
+    return {"status": "success"}
+
+
+@router.get("/export", dependencies=[Depends(require_admin_token)])
+def export_surveys(
+    format: str = "csv",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    recommendations: bool = True,
+):
+    """Stream survey responses (and stored recommendations) as CSV or Parquet."""
+    if format not in export.FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {sorted(export.FORMATS)}")
+    try:
+        start_at, end_at = export.parse_date(start), export.parse_date(end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start/end must be ISO dates")
+    try:
+        chunks = export.stream_export(SessionLocal, format, start_at, end_at, recommendations)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=501, detail=str(exc))
+    return StreamingResponse(
+        chunks,
+        media_type=export.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="survey_responses.{format}"'},
+    )
@@ -0,0 +1,62 @@
+import hashlib
+import json
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from cache import TTLCache
+from database import SessionLocal
+from models import Job
+from recommendation import CATALOG_TTL_SECONDS
+from responses import FastJSONResponse
+
+router = APIRouter()
+
+# Job descriptions only change when the ETL scripts run
+JOB_CACHE_MAX_AGE = int(os.getenv("JOB_CACHE_MAX_AGE", "86400"))
+
+# soc_code -> (etag, payload); expires with the compiled catalog, so an ETL
+# run shows up here (and in /results details) as soon as it does in scoring
+_job_cache = TTLCache(int(os.getenv("JOB_CACHE_SIZE", "2000")), CATALOG_TTL_SECONDS)
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def load_job(db: Session, soc_code: str):
+    """(etag, payload) for the first job with `soc_code`, cached; None if unknown."""
+    cached = _job_cache.get(soc_code)
+    if cached is not None:
+        return cached
+    job = db.query(Job).filter(Job.soc_code == soc_code).order_by(Job.id).first()
+    if job is None:
+        return None
+    payload = {
+        "soc_code": job.soc_code,
+        "title": job.title,
+        "description": job.description,
+        "focus_area": job.focus_area,
+        "job_zone": job.job_zone,
+    }
+    etag = '"' + hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16] + '"'
+    _job_cache.put(soc_code, (etag, payload))
+    return etag, payload
+
+
+@router.get("/jobs/{soc_code}")
+def get_job(soc_code: str, request: Request, db: Session = Depends(get_db)):
+    """Job details (including the O*NET description) omitted by compact /submit responses."""
+    loaded = load_job(db, soc_code)
+    if loaded is None:
+        raise HTTPException(status_code=404, detail="Unknown SOC code")
+    etag, payload = loaded
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={JOB_CACHE_MAX_AGE}"}
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(payload, headers=headers)
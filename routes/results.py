@@ -0,0 +1,103 @@
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from cache import LRUCache
+from database import SessionLocal
+from models import RecommendationResult
+from responses import JOB_FIELDS, FastJSONResponse, parse_job_fields, project_jobs
+from routes.jobs import load_job
+from schemas import ResultResponse
+
+router = APIRouter()
+
+# data_id -> response payload; filled on submit and on first read
+RESULTS_CACHE = LRUCache(int(os.getenv("RESULTS_CACHE_SIZE", "10000")))
+
+# Fields kept in recommendation_results.top_jobs; the rest of JOB_FIELDS
+# (description, focus_area, job_zone) come from the /jobs lookup when served
+STORED_JOB_FIELDS = ("soc_code", "title", "score", "components")
+DETAIL_FIELDS = tuple(f for f in JOB_FIELDS if f not in STORED_JOB_FIELDS)
+
+
+def stored_jobs(top_jobs: list):
+    """Top jobs reduced to STORED_JOB_FIELDS for storage and RESULTS_CACHE."""
+    return [{f: job[f] for f in STORED_JOB_FIELDS if f in job} for job in top_jobs]
+
+
+def with_job_details(db: Session, payload: dict, job_fields=None):
+    """
+    Copy of a result payload whose top jobs carry the DETAIL_FIELDS among
+    `job_fields` (all of them for None), resolved through the /jobs cache.
+    """
+    wanted = [f for f in DETAIL_FIELDS if job_fields is None or f in job_fields]
+    if not wanted:
+        return payload
+    top_jobs = []
+    for job in payload["top_jobs"]:
+        loaded = load_job(db, job["soc_code"])
+        details = loaded[1] if loaded is not None else {}
+        top_jobs.append({**job, **{f: details.get(f) for f in wanted}})
+    return {**payload, "top_jobs": top_jobs}
+
+
+def result_payload(data_id: int, recommended_major: str, top_jobs: list,
+                   catalog_version: str, weights_version: str, major_ranking: list):
+    return {
+        "status": "success",
+        "data_id": data_id,
+        "recommended_major": recommended_major,
+        "major_ranking": major_ranking,
+        "top_jobs": top_jobs,
+        "catalog_version": catalog_version,
+        "weights_version": weights_version,
+    }
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def load_result(db: Session, data_id: int):
+    """
+    Cached result payload for `data_id`, read through from the table; None if
+    absent. Top jobs hold only STORED_JOB_FIELDS (see with_job_details).
+    """
+    payload = RESULTS_CACHE.get(data_id)
+    if payload is None:
+        row = (
+            db.query(RecommendationResult)
+            .filter(RecommendationResult.survey_id == data_id)
+            .first()
+        )
+        if row is None:
+            return None
+        payload = result_payload(
+            data_id, row.recommended_major, stored_jobs(row.top_jobs or []), row.catalog_version,
+            row.weights_version, row.major_ranking,
+        )
+        RESULTS_CACHE.put(data_id, payload)
+    return payload
+
+
+@router.get("/results/{data_id}", response_model=ResultResponse, response_class=FastJSONResponse)
+def get_results(
+    data_id: int,
+    compact: bool = False,
+    fields: Optional[str] = None,
+    explain: bool = False,
+    db: Session = Depends(get_db),
+):
+    """Stored recommendations for a submitted survey (never rescored)."""
+    job_fields = parse_job_fields(compact, fields)
+    payload = load_result(db, data_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="No results for this data_id")
+    payload = with_job_details(db, payload, job_fields)
+    return FastJSONResponse(project_jobs(payload, job_fields, explain))
@@ -1,13 +1,39 @@
-from fastapi import APIRouter, Depends
+import hashlib
+import json
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from cache import TTLCache
+from dashboard import record_submission
 from database import SessionLocal
-from schemas import SurveySchema
-from models import SurveyResponse
+from metrics import stage
+from profiling import maybe_profile
+from rate_limit import client_key
+from schemas import SubmitResponse, SurveySchema
+from models import RecommendationResult, SurveyResponse
 from recommendation import generate_recommendation
+from responses import FastJSONResponse, parse_job_fields, project_jobs
+from routes.results import RESULTS_CACHE, load_result, result_payload, stored_jobs, with_job_details
 
 router = APIRouter()
 
+# Replays of an Idempotency-Key are answered from memory for this long
+# (and from the database after that)
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600"))
+# Identical payloads from the same client without a key count as retries
+# only within this much shorter window
+DUPLICATE_WINDOW_SECONDS = float(os.getenv("DUPLICATE_WINDOW_SECONDS", "30"))
+MAX_IDEMPOTENCY_KEY_LENGTH = 128
+
+# request key -> {"payload_hash": str, "response": dict}
+_recent_submissions = TTLCache(
+    int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000")), IDEMPOTENCY_TTL_SECONDS
+)
+
 
 def get_db():
     db = SessionLocal()
@@ -17,20 +43,121 @@ def get_db():
         db.close()
 
 
-@router.post("/submit")
-def submit_survey(data: SurveySchema, db: Session = Depends(get_db)):
-    # Save survey response
-    db_entry = SurveyResponse(**data.dict())
-    db.add(db_entry)
-    db.commit()
-    db.refresh(db_entry)
+def _payload_hash(data: SurveySchema):
+    canonical = json.dumps(data.dict(), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
 
-    # Generate recommendations (major + top jobs)
-    rec = generate_recommendation(data, db, top_n=5)
 
+def _submit_response(payload: dict):
     return {
         "status": "success",
-        "recommended_major": rec["recommended_major"],
-        "top_jobs": rec["top_jobs"],
-        "data_id": db_entry.id,
+        "recommended_major": payload["recommended_major"],
+        "major_ranking": payload["major_ranking"],
+        "top_jobs": payload["top_jobs"],
+        "data_id": payload["data_id"],
     }
+
+
+def _replay(db: Session, idempotency_key: str, payload_hash: str):
+    """Response of an earlier submission stored under `idempotency_key`, if any."""
+    existing = (
+        db.query(SurveyResponse.id, SurveyResponse.payload_hash)
+        .filter(SurveyResponse.idempotency_key == idempotency_key)
+        .first()
+    )
+    if existing is None:
+        return None
+    if existing.payload_hash != payload_hash:
+        raise HTTPException(status_code=409, detail="Idempotency-Key was already used with a different survey")
+    payload = load_result(db, existing.id)
+    return _submit_response(with_job_details(db, payload)) if payload else None
+
+
+@router.post("/submit", response_model=SubmitResponse, response_class=FastJSONResponse)
+def submit_survey(
+    data: SurveySchema,
+    request: Request,
+    compact: bool = False,
+    fields: Optional[str] = None,
+    explain: bool = False,
+    db: Session = Depends(get_db),
+):
+    """
+    Store a survey and return its recommendations. `compact=true` trims each
+    top job to soc_code/title/score (details via GET /jobs/{soc_code});
+    `fields=` picks an explicit subset. `explain=true` adds each top job's
+    per-component score breakdown.
+    """
+    job_fields = parse_job_fields(compact, fields)
+    response = _submit(data, request, db)
+    return FastJSONResponse(project_jobs(response, job_fields, explain))
+
+
+def _submit(data: SurveySchema, request: Request, db: Session):
+    idempotency_key = request.headers.get("Idempotency-Key")
+    if idempotency_key is not None and not 0 < len(idempotency_key) <= MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail="Invalid Idempotency-Key")
+    payload_hash = _payload_hash(data)
+
+    # Retries are answered from memory without an insert or a scoring pass
+    if idempotency_key:
+        request_key = f"key:{idempotency_key}"
+    else:
+        request_key = f"hash:{client_key(request)}:{payload_hash}"
+    recent = _recent_submissions.get(request_key)
+    if recent is not None:
+        if recent["payload_hash"] != payload_hash:
+            raise HTTPException(status_code=409, detail="Idempotency-Key was already used with a different survey")
+        return recent["response"]
+
+    if idempotency_key:
+        replayed = _replay(db, idempotency_key, payload_hash)
+        if replayed is not None:
+            _recent_submissions.put(request_key, {"payload_hash": payload_hash, "response": replayed})
+            return replayed
+
+    with maybe_profile(request, "submit"):
+        # Generate recommendations (major + top jobs)
+        rec = generate_recommendation(data, db, top_n=5)
+
+        # Save survey response and its results in one flush/commit
+        top_jobs = stored_jobs(rec["top_jobs"])
+        with stage("db_insert"):
+            db_entry = SurveyResponse(
+                **data.dict(), idempotency_key=idempotency_key, payload_hash=payload_hash
+            )
+            db_entry.recommendation = RecommendationResult(
+                recommended_major=rec["recommended_major"],
+                major_ranking=rec["major_ranking"],
+                top_jobs=top_jobs,
+                catalog_version=rec["catalog_version"],
+                weights_version=rec["weights_version"],
+            )
+            db.add(db_entry)
+            try:
+                db.flush()
+                data_id = db_entry.id
+                # Last, so the counter row locks are held only until the commit
+                record_submission(db, db_entry)
+                db.commit()
+            except IntegrityError:
+                # A concurrent retry with the same key committed first
+                db.rollback()
+                replayed = _replay(db, idempotency_key, payload_hash) if idempotency_key else None
+                if replayed is None:
+                    raise
+                return replayed
+
+    payload = result_payload(
+        data_id, rec["recommended_major"], rec["top_jobs"], rec["catalog_version"],
+        rec["weights_version"], rec["major_ranking"],
+    )
+    RESULTS_CACHE.put(data_id, {**payload, "top_jobs": top_jobs})
+
+    response = _submit_response(payload)
+    _recent_submissions.put(
+        request_key,
+        {"payload_hash": payload_hash, "response": response},
+        ttl=None if idempotency_key else DUPLICATE_WINDOW_SECONDS,
+    )
+    return response
@@ -1,3 +1,5 @@
+from typing import Dict, List, Optional
+
 from pydantic import BaseModel
 
 
@@ -30,3 +32,35 @@ class SurveySchema(BaseModel):
     s1: int
     e1: int
     c1: int
+
+
+class JobMatch(BaseModel):
+    # Only soc_code/title/score with ?compact=true, or the ?fields= subset
+    soc_code: str
+    title: Optional[str] = None
+    score: Optional[float] = None
+    focus_area: Optional[str] = None
+    description: Optional[str] = None
+    job_zone: Optional[int] = None
+    # Per-component score breakdown, with ?explain=true
+    components: Optional[Dict[str, float]] = None
+
+
+class MajorScore(BaseModel):
+    major: str
+    # Mean of the major's best job scores
+    score: float
+
+
+class SubmitResponse(BaseModel):
+    status: str
+    recommended_major: str
+    # All majors best first (None for results stored before majors were ranked)
+    major_ranking: Optional[List[MajorScore]] = None
+    top_jobs: List[JobMatch]
+    data_id: int
+
+
+class ResultResponse(SubmitResponse):
+    catalog_version: Optional[str] = None
+    weights_version: Optional[str] = None
@@ -0,0 +1,502 @@
+"""
+Vectorized job scoring.
+
+The job catalog is compiled once into numpy arrays, one row per distinct SOC
+code. The weights config is compiled into a ScoringWeights, whose vector
+holds one weight per component. A survey profile is then scored against every
+row at once. `component_matrix()` returns one weighted column per score
+component. A job's score is the weights' baseline plus its row sum, and the
+explain=true breakdown reads the same row.
+"""
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Score components, in column order
+COMPONENTS = (
+    "data_fit",
+    "tech_fit",
+    "comm_fit",
+    "stability_fit",
+    "salary_fit",
+    "remote",
+    "role_match",
+    "riasec",
+    "data_skills",
+    "people_skills",
+    "tech_knowledge",
+    "business_knowledge",
+    "graduate_fit",
+)
+
+# Weights config, reloaded when the file changes; DEFAULT_WEIGHTS apply
+# while it does not exist
+SCORING_WEIGHTS_PATH = os.getenv("SCORING_WEIGHTS_PATH", "scoring_weights.json")
+
+DEFAULT_WEIGHTS = {
+    "version": "builtin",
+    # positive baseline every job starts from
+    "baseline": 10.0,
+    # weight of each component's raw feature (see component_matrix)
+    "components": {
+        "data_fit": 0.5,  # -|required - preferred|
+        "tech_fit": 0.5,
+        "comm_fit": 0.5,
+        "stability_fit": 0.4,
+        "salary_fit": 0.4,
+        "remote": 2.5,  # job allows remote work and the user wants it
+        "role_match": 3.5,  # job focus area equals the chosen role type
+        "riasec": 8.0,  # cosine similarity; interests are strong drivers
+        "data_skills": 1.0,  # 5 - |aggregate - preference|
+        "people_skills": 1.0,
+        "tech_knowledge": 1.0,
+        "business_knowledge": 1.0,
+        "graduate_fit": 1.0,  # education requirements suit a master's graduate (0-1)
+    },
+    # blend of the estimated (Q1-Q15) and explicit (Q16-Q21) RIASEC profiles
+    "riasec_blend": {"estimated": 0.6, "custom": 1.0},
+    # O*NET importance (0-100) to the survey's 1-5 scale, approximately
+    "aggregate_scale": 20.0,
+}
+
+# Majors as sets of focus areas and/or SOC code prefixes; a major's score is
+# the mean of its top_k job scores. DEFAULT_MAJORS apply while the file does
+# not exist. The file is read whenever the catalog is compiled.
+MAJORS_PATH = os.getenv("MAJORS_PATH", "majors.json")
+
+DEFAULT_MAJORS = {
+    "top_k": 5,
+    "default": "MS in Information Systems",
+    "majors": [
+        {"name": "MS in Data Analytics", "focus_areas": ["data analysis"]},
+        {"name": "MS in Cybersecurity", "focus_areas": ["cybersecurity"]},
+        {"name": "MS in Software Engineering / IT", "focus_areas": ["technology design"]},
+        {"name": "MS in Information Systems", "focus_areas": ["systems management"]},
+    ],
+}
+
+AGGREGATE_KEYS = ("data_skills", "people_skills", "tech_knowledge", "business_knowledge")
+
+# Required Level of Education (RL) category of a master's degree; also
+# load_education's graduate_share threshold
+MASTERS_CATEGORY = 8
+# Job columns that feed the score, fingerprinted into the catalog version
+SCORED_JOB_COLUMNS = (
+    "id", "soc_code", "focus_area", "required_data_skill", "required_tech_interest",
+    "required_communication", "stability_level", "salary_level", "remote_possible", "job_zone",
+    "riasec_r", "riasec_i", "riasec_a", "riasec_s", "riasec_e", "riasec_c",
+    "education_level", "graduate_share",
+)
+
+
+def catalog_version(jobs, skill_aggs: dict):
+    """
+    Short fingerprint of the job catalog a result was computed against,
+    covering every scored job column and the skill/knowledge aggregates.
+    It is stored with persisted results so they can be told apart after an
+    ETL run, and it keys the recommendation cache.
+    """
+    digest = hashlib.sha1()
+    for job in jobs:
+        digest.update(repr([getattr(job, c) for c in SCORED_JOB_COLUMNS]).encode())
+    digest.update(repr(sorted((soc, sorted(v.items())) for soc, v in skill_aggs.items())).encode())
+    return f"{len(jobs)}-{digest.hexdigest()[:12]}"
+
+
+def graduate_fit(job):
+    """
+    How well a job's education requirements suit a master's graduate (0-1):
+    the mean of its graduate_share and of how close its education_level is
+    to a master's. Jobs without the education features (load_education.py
+    not run) fall back to 1 for Job Zone >= 4, else 0.
+    """
+    if job.education_level is None or job.graduate_share is None:
+        return 1.0 if (job.job_zone or 0) >= 4 else 0.0
+    level_fit = max(0.0, 1 - abs(job.education_level - MASTERS_CATEGORY) / 4)
+    return (job.graduate_share + level_fit) / 2
+
+
+def validate_majors(config):
+    """
+    Checked copy of a majors config: a list of majors, each with a `name`
+    and lists of `focus_areas` and/or `soc_prefixes` strings, an optional
+    positive `top_k` and an optional `default` name. Raises ValueError.
+    """
+    if not isinstance(config, dict) or not isinstance(config.get("majors"), list):
+        raise ValueError("Majors config: expected an object with a 'majors' list")
+    majors = []
+    for n, major in enumerate(config["majors"]):
+        if not isinstance(major, dict) or not isinstance(major.get("name"), str) or not major["name"]:
+            raise ValueError(f"Majors config: majors[{n}] needs a 'name'")
+        for key in ("focus_areas", "soc_prefixes"):
+            values = major.get(key, [])
+            if not isinstance(values, list) or not all(isinstance(v, str) and v for v in values):
+                raise ValueError(f"Majors config: {major['name']!r} {key} must be a list of strings")
+        majors.append({
+            "name": major["name"],
+            "focus_areas": list(major.get("focus_areas", [])),
+            "soc_prefixes": list(major.get("soc_prefixes", [])),
+        })
+    top_k = config.get("top_k", DEFAULT_MAJORS["top_k"])
+    if isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1:
+        raise ValueError("Majors config: top_k must be a positive integer")
+    default = config.get("default", DEFAULT_MAJORS["default"])
+    if not isinstance(default, str):
+        raise ValueError("Majors config: default must be a string")
+    return {"top_k": top_k, "default": default, "majors": majors}
+
+
+_majors = validate_majors(DEFAULT_MAJORS)
+_majors_lock = threading.Lock()
+
+
+def load_majors(path=None):
+    """
+    Majors config from `path` (MAJORS_PATH), or DEFAULT_MAJORS if it does not
+    exist. A file that fails to parse or validate is logged and the last good
+    config stays in effect, like current_weights().
+    """
+    global _majors
+    path = path or MAJORS_PATH
+    try:
+        with open(path) as f:
+            majors = validate_majors(json.load(f))
+    except FileNotFoundError:
+        majors = validate_majors(DEFAULT_MAJORS)
+    except (OSError, ValueError) as exc:
+        logger.error("Keeping the previous majors config; could not load %s: %s", path, exc)
+        return _majors
+    with _majors_lock:
+        _majors = majors
+    return majors
+
+
+class Catalog:
+    """
+    Jobs and their skill/knowledge aggregates compiled into arrays. Only the
+    first job (in the given order) of each SOC code is kept. Job details are
+    copied into plain dicts so the catalog outlives the session it was loaded
+    with. `majors` (see DEFAULT_MAJORS) becomes a (majors x jobs) membership
+    matrix.
+    """
+
+    def __init__(self, jobs, skill_aggs: dict, majors: dict = None):
+        self.version = catalog_version(jobs, skill_aggs)
+
+        unique = {}
+        for job in jobs:
+            unique.setdefault(job.soc_code, job)
+        jobs = list(unique.values())
+
+        self.jobs = [
+            {
+                "title": j.title,
+                "soc_code": j.soc_code,
+                "focus_area": j.focus_area,
+                "description": j.description,
+                "job_zone": j.job_zone,
+            }
+            for j in jobs
+        ]
+        self.requirements = np.array(
+            [
+                (
+                    j.required_data_skill or 3,
+                    j.required_tech_interest or 3,
+                    j.required_communication or 3,
+                    j.stability_level or 3,
+                    j.salary_level or 3,
+                )
+                for j in jobs
+            ],
+            dtype=float,
+        ).reshape(len(jobs), 5)
+        self.remote_possible = np.array([bool(j.remote_possible) for j in jobs], dtype=float)
+
+        # Focus areas as integer codes; jobs without one never match (-1)
+        self._focus_codes = {}
+        self.focus = np.array(
+            [
+                self._focus_codes.setdefault(j.focus_area.lower(), len(self._focus_codes))
+                if j.focus_area else -1
+                for j in jobs
+            ],
+            dtype=np.int64,
+        )
+
+        riasec = np.array(
+            [
+                (
+                    j.riasec_r or 3,
+                    j.riasec_i or 3,
+                    j.riasec_a or 3,
+                    j.riasec_s or 3,
+                    j.riasec_e or 3,
+                    j.riasec_c or 3,
+                )
+                for j in jobs
+            ],
+            dtype=float,
+        ).reshape(len(jobs), 6)
+        norms = np.linalg.norm(riasec, axis=1, keepdims=True)
+        self.riasec_unit = np.divide(riasec, norms, out=np.zeros_like(riasec), where=norms > 0)
+
+        self.aggregates = np.array(
+            [
+                [skill_aggs.get(j.soc_code, {}).get(key) or 0 for key in AGGREGATE_KEYS]
+                for j in jobs
+            ],
+            dtype=float,
+        ).reshape(len(jobs), len(AGGREGATE_KEYS))
+        self.graduate = np.array([graduate_fit(j) for j in jobs], dtype=float)
+
+        majors = validate_majors(majors or DEFAULT_MAJORS)
+        self.majors = [m["name"] for m in majors["majors"]]
+        self.major_top_k = majors["top_k"]
+        self.default_major = majors["default"]
+        self.majors_version = hashlib.sha1(json.dumps(majors, sort_keys=True).encode()).hexdigest()[:8]
+        self.major_membership = np.zeros((len(self.majors), len(jobs)), dtype=bool)
+        for m, major in enumerate(majors["majors"]):
+            focus_areas = {f.lower() for f in major["focus_areas"]}
+            prefixes = tuple(major["soc_prefixes"])
+            for n, j in enumerate(jobs):
+                self.major_membership[m, n] = (
+                    (j.focus_area or "").lower() in focus_areas
+                    or (bool(prefixes) and j.soc_code.startswith(prefixes))
+                )
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def focus_code(self, focus_pref):
+        """Code of a survey role type; -2 (matches nothing) when unknown or empty."""
+        if not focus_pref:
+            return -2
+        return self._focus_codes.get(focus_pref.lower(), -2)
+
+
+# ---------------------------------------------------------
+# WEIGHTS
+# ---------------------------------------------------------
+class ScoringWeights:
+    """
+    A weights config compiled for component_matrix(). Never mutated after
+    construction, so a scoring pass that holds one sees consistent weights.
+    `version` is the config's declared version plus a hash of its contents,
+    which changes even when an edit forgets to bump the declared version.
+    """
+
+    def __init__(self, config: dict):
+        components = config["components"]
+        missing = [c for c in COMPONENTS if c not in components]
+        unknown = [c for c in components if c not in COMPONENTS]
+        if missing or unknown:
+            raise ValueError(f"Scoring weights: missing components {missing}, unknown {unknown}")
+
+        self.vector = np.array([float(components[c]) for c in COMPONENTS])
+        self.vector.flags.writeable = False
+        # Keys a file leaves out take the built-in values
+        self.baseline = float(config.get("baseline", DEFAULT_WEIGHTS["baseline"]))
+        blend = {**DEFAULT_WEIGHTS["riasec_blend"], **config.get("riasec_blend", {})}
+        self.riasec_estimated = float(blend["estimated"])
+        self.riasec_custom = float(blend["custom"])
+        self.aggregate_scale = float(config.get("aggregate_scale", DEFAULT_WEIGHTS["aggregate_scale"]))
+        if self.aggregate_scale <= 0:
+            raise ValueError("Scoring weights: aggregate_scale must be positive")
+
+        digest = hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:8]
+        self.version = f"{config.get('version', 'unversioned')}-{digest}"
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f))
+
+
+_weights = ScoringWeights(DEFAULT_WEIGHTS)
+_weights_stamp = None  # (mtime_ns, size) of the loaded file, None for DEFAULT_WEIGHTS
+_weights_lock = threading.Lock()
+
+
+def current_weights():
+    """
+    The weights in effect. SCORING_WEIGHTS_PATH is checked on each call and
+    reloaded when its mtime or size changes. The new weights replace the old
+    in a single reference swap, and only once they have compiled. A file that
+    fails to parse or validate is logged and the previous weights stay in
+    effect until the file changes again.
+    """
+    global _weights, _weights_stamp
+    try:
+        st = os.stat(SCORING_WEIGHTS_PATH)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        stamp = None
+    if stamp == _weights_stamp:
+        return _weights
+
+    with _weights_lock:
+        if stamp != _weights_stamp:
+            try:
+                weights = (
+                    ScoringWeights.load(SCORING_WEIGHTS_PATH) if stamp
+                    else ScoringWeights(DEFAULT_WEIGHTS)
+                )
+            except (OSError, ValueError, KeyError, TypeError) as exc:
+                logger.error("Keeping scoring weights %s; could not load %s: %s",
+                             _weights.version, SCORING_WEIGHTS_PATH, exc)
+            else:
+                _weights = weights
+                logger.info("Loaded scoring weights %s", weights.version)
+            _weights_stamp = stamp
+    return _weights
+
+
+# ---------------------------------------------------------
+# SCORING
+# ---------------------------------------------------------
+def _profile_inputs(catalog: Catalog, profiles):
+    """The profile values the score components use, stacked into one array per input."""
+    n = len(profiles)
+    return {
+        "preferred": np.array([
+            (p["data_pref"], p["tech_interest"], p["comm"], p["stability"], p["salary"])
+            for p in profiles
+        ], dtype=float).reshape(n, 5),
+        "remote": np.array([bool(p["remote"]) for p in profiles], dtype=float),
+        "focus": np.array([catalog.focus_code(p["focus_pref"]) for p in profiles], dtype=np.int64),
+        "riasec_estimated": np.array([p["riasec_estimated"] for p in profiles], dtype=float).reshape(n, 6),
+        "riasec_custom": np.array([p["riasec_custom"] for p in profiles], dtype=float).reshape(n, 6),
+        "aggregate_prefs": np.array([
+            (p["data_pref"], p["comm"], p["tech_interest"], p["stability"]) for p in profiles
+        ], dtype=float).reshape(n, 4),
+    }
+
+
+def _profile_features(catalog: Catalog, inputs: dict):
+    """
+    Yield (column, feature) for the unweighted components that do not depend
+    on the weights: `column` indexes COMPONENTS and `feature` is a
+    (profiles x jobs) array, or one that broadcasts to it. One column at a
+    time keeps batch_scores' temporaries to a single (profiles x jobs) array.
+    """
+    # 1-2) Data / tech / communication, stability and salary fit
+    for k in range(5):
+        yield k, -np.abs(catalog.requirements[None, :, k] - inputs["preferred"][:, k, None])
+
+    # 3-4) Remote preference and role match
+    yield 5, inputs["remote"][:, None] * catalog.remote_possible[None, :]
+    yield 6, inputs["focus"][:, None] == catalog.focus[None, :]
+
+    # 7) Graduate-degree fit (precomputed per job)
+    yield 12, catalog.graduate[None, :]
+
+
+def _weighted_features(catalog: Catalog, inputs: dict, weights: ScoringWeights):
+    """
+    Yield (column, feature) as _profile_features does, for the components
+    that depend on the RIASEC blend and the aggregate scale of `weights`.
+    """
+    # 5) Combined RIASEC similarity (estimated + explicit)
+    user = (
+        inputs["riasec_estimated"] * weights.riasec_estimated
+        + inputs["riasec_custom"] * weights.riasec_custom
+    )
+    norms = np.linalg.norm(user, axis=1, keepdims=True)
+    user = np.divide(user, norms, out=np.zeros_like(user), where=norms > 0)
+    yield 7, user @ catalog.riasec_unit.T
+
+    # 6) Skills and knowledge aggregates: reward similarity
+    scaled = catalog.aggregates / weights.aggregate_scale
+    for k in range(4):
+        yield 8 + k, 5 - np.abs(scaled[None, :, k] - inputs["aggregate_prefs"][:, k, None])
+
+
+def component_matrix(catalog: Catalog, profile: dict, weights: ScoringWeights):
+    """(jobs x COMPONENTS) array of score components for `profile`, scaled by `weights`."""
+    inputs = _profile_inputs(catalog, [profile])
+    # Filled one contiguous row per component, returned transposed
+    features = np.empty((len(COMPONENTS), len(catalog)))
+    for column, feature in itertools.chain(
+        _profile_features(catalog, inputs), _weighted_features(catalog, inputs, weights)
+    ):
+        features[column] = feature[0]
+    features *= weights.vector[:, None]
+    return features.T
+
+
+def batch_scores(catalog: Catalog, profiles, weights_list):
+    """
+    (profiles x jobs) score matrices, one per entry of `weights_list`. Each
+    row equals total_scores(component_matrix(...)) for that profile: both use
+    the same feature builders. The components are accumulated straight into
+    the sums instead of being kept, and features that do not depend on the
+    weights are computed once for all weight sets.
+    """
+    inputs = _profile_inputs(catalog, profiles)
+    results = [np.full((len(profiles), len(catalog)), w.baseline) for w in weights_list]
+
+    for column, feature in _profile_features(catalog, inputs):
+        for weights, out in zip(weights_list, results):
+            if weights.vector[column]:
+                out += weights.vector[column] * feature
+
+    for weights, out in zip(weights_list, results):
+        for column, feature in _weighted_features(catalog, inputs, weights):
+            if weights.vector[column]:
+                out += weights.vector[column] * feature
+
+    return results
+
+
+def total_scores(components, weights: ScoringWeights):
+    return weights.baseline + components.sum(axis=1)
+
+
+def top_indices(scores, n: int):
+    """Indices of the `n` highest scores, best first; ties keep catalog order."""
+    return np.argsort(-scores, kind="stable")[:n]
+
+
+def major_scores(catalog: Catalog, scores):
+    """
+    Score of every major: the mean of its `major_top_k` best job scores, or
+    -inf for a major with no jobs in the catalog. Computed for all majors at
+    once on the membership matrix.
+    """
+    if not len(catalog.majors) or not len(catalog):
+        return np.full(len(catalog.majors), -np.inf)
+    masked = np.where(catalog.major_membership, scores[None, :], -np.inf)
+    k = min(catalog.major_top_k, len(catalog))
+    top = -np.partition(-masked, k - 1, axis=1)[:, :k]
+    finite = np.isfinite(top)
+    counts = finite.sum(axis=1)
+    sums = np.where(finite, top, 0.0).sum(axis=1)
+    return np.divide(sums, counts, out=np.full(len(catalog.majors), -np.inf), where=counts > 0)
+
+
+def major_ranking(catalog: Catalog, scores):
+    """[{"major", "score"}, ...] best first, leaving out majors with no jobs."""
+    by_major = major_scores(catalog, scores)
+    return [
+        {"major": catalog.majors[m], "score": round(float(by_major[m]), 3)}
+        for m in np.argsort(-by_major, kind="stable")
+        if np.isfinite(by_major[m])
+    ]
+
+
+def explain(components_row, weights: ScoringWeights):
+    """Per-component breakdown of one job's score; the values sum to its score."""
+    breakdown = {"baseline": weights.baseline}
+    breakdown.update(
+        # + 0.0 turns -0.0 (a perfect fit) into 0.0
+        (name, round(float(value), 3) + 0.0) for name, value in zip(COMPONENTS, components_row)
+    )
+    return breakdown
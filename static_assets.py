@@ -0,0 +1,103 @@
+"""
+Static files served from memory with strong ETags and precompressed
+variants.
+
+Every file under the directory is read once at startup. Each file gets a
+content-hash ETag and, for text types, gzip and Brotli variants (Brotli only
+when the `brotli` package is installed). The variant is chosen from
+Accept-Encoding. Fingerprinted names (e.g. app.3f2a9c1b.js) are cached for a
+year as immutable. Everything else is sent with `no-cache`, so browsers
+revalidate and usually get a 304.
+"""
+import gzip
+import hashlib
+import mimetypes
+import re
+from pathlib import Path
+
+from fastapi import Request, Response
+
+from compression import accepted_encodings
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+FINGERPRINT_RE = re.compile(r"\.[0-9a-f]{8,}\.")
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+MIN_COMPRESS_SIZE = 256
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+class _Asset:
+    def __init__(self, path: Path, name: str):
+        self.data = path.read_bytes()
+        media_type, _ = mimetypes.guess_type(name)
+        self.media_type = media_type or "application/octet-stream"
+        if self.media_type.startswith("text/"):
+            self.media_type += "; charset=utf-8"
+        self.cache_control = (
+            IMMUTABLE_CACHE_CONTROL if FINGERPRINT_RE.search(name) else REVALIDATE_CACHE_CONTROL
+        )
+
+        digest = hashlib.sha256(self.data).hexdigest()[:32]
+        # encoding -> (etag, body); strong ETags must differ per representation
+        self.variants = {"identity": (f'"{digest}"', self.data)}
+        if self.media_type.startswith(COMPRESSIBLE_TYPES) and len(self.data) >= MIN_COMPRESS_SIZE:
+            gz = gzip.compress(self.data, compresslevel=9, mtime=0)
+            if len(gz) < len(self.data):
+                self.variants["gzip"] = (f'"{digest}-gz"', gz)
+            if brotli is not None:
+                br = brotli.compress(self.data, quality=11)
+                if len(br) < len(self.data):
+                    self.variants["br"] = (f'"{digest}-br"', br)
+
+    def etags(self):
+        return {etag for etag, _ in self.variants.values()}
+
+
+class StaticAssets:
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.assets = {}
+        for path in sorted(self.directory.rglob("*")):
+            if path.is_file() and not path.name.startswith("."):
+                name = path.relative_to(self.directory).as_posix()
+                self.assets[name] = _Asset(path, name)
+
+    def _choose(self, asset: _Asset, accept_encoding: str):
+        accepted = accepted_encodings(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in asset.variants:
+                return encoding
+        return "identity"
+
+    def response(self, name: str, request: Request):
+        asset = self.assets.get(name)
+        if asset is None:
+            return Response("Not Found", status_code=404, media_type="text/plain")
+
+        encoding = self._choose(asset, request.headers.get("accept-encoding", ""))
+        etag, body = asset.variants[encoding]
+        headers = {
+            "ETag": etag,
+            "Cache-Control": asset.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            # Any variant's ETag identifies the same content, so it validates
+            tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+            if "*" in tags or tags & asset.etags():
+                return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(len(body))
+            return Response(status_code=200, headers=headers, media_type=asset.media_type)
+        return Response(body, headers=headers, media_type=asset.media_type)
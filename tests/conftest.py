@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# database.py reads DATABASE_URL on import; never touch the real database
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='grad-major-tests-')}/test.db"
+os.environ.setdefault("SUBMIT_RATE_LIMIT_PER_MINUTE", "0")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+# main.py serves static/ and templates/ relative to the working directory
+os.chdir(REPO_ROOT)
@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+import profiling
+from database import Base, engine
+from main import app
+
+
+def test_export_fails_closed_without_admin_token(monkeypatch):
+    monkeypatch.setattr(profiling, "ADMIN_TOKEN", "")
+    client = TestClient(app)
+    assert client.get("/admin/export").status_code == 403
+    assert client.get("/admin/export", headers={"X-Admin-Token": ""}).status_code == 403
+
+
+def test_export_requires_matching_token(monkeypatch):
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(profiling, "ADMIN_TOKEN", "secret")
+    client = TestClient(app)
+    assert client.get("/admin/export", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    response = client.get("/admin/export", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    header = response.text.splitlines()[0].split(",")
+    assert "idempotency_key" not in header and "payload_hash" not in header
+    assert header[:2] == ["id", "submitted_at"]
+
+
+
+def test_profile_routes_fail_closed_without_admin_token(monkeypatch):
+    monkeypatch.setattr(profiling, "ADMIN_TOKEN", "")
+    client = TestClient(app)
+    assert client.get("/admin/profiles").status_code == 403
+    assert client.get("/admin/profiles/submit/pstats").status_code == 403
+    assert client.get("/admin/profiles/submit/flamegraph").status_code == 403
+    assert client.delete("/admin/profiles").status_code == 403
+
+    monkeypatch.setattr(profiling, "ADMIN_TOKEN", "secret")
+    assert client.get("/admin/profiles", headers={"X-Admin-Token": "secret"}).status_code == 200
@@ -0,0 +1,56 @@
+from benchmarks.synthetic import generate_payloads
+from dashboard import dashboard_stats, rebuild_counters, record_submission, recent_surveys
+from database import Base, SessionLocal, engine
+from models import SurveyCounter, SurveyResponse
+
+
+def test_recent_surveys_pages_do_not_repeat():
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.query(SurveyResponse).delete()
+        # Inserted within the same second, as SQLite's now() default records them
+        db.add_all(SurveyResponse(**p) for p in generate_payloads(45))
+        db.commit()
+
+        first, cursor = recent_surveys(db, limit=20)
+        second, cursor2 = recent_surveys(db, before=cursor, limit=20)
+        third, cursor3 = recent_surveys(db, before=cursor2, limit=20)
+
+        ids = [r.id for r in first + second + third]
+        assert len(ids) == 45
+        assert ids == sorted(ids, reverse=True)
+        assert len(set(ids)) == 45
+        assert cursor3 is None
+
+
+def test_dashboard_stats_sum_counter_shards():
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.query(SurveyCounter).delete()
+        entries = [SurveyResponse(**p) for p in generate_payloads(40)]
+        for entry in entries:
+            record_submission(db, entry)
+        db.commit()
+
+        stats = dashboard_stats(db)
+        assert stats["total_surveys"] == 40
+        assert sum(r["count"] for r in stats["role_distribution"]) == 40
+        assert stats["submissions_per_day"][0]["count"] == 40
+        assert db.query(SurveyCounter).filter(SurveyCounter.name.like("total#%")).count() > 0
+
+
+def test_rebuilt_counters_match_live_counters():
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.query(SurveyResponse).delete()
+        db.query(SurveyCounter).delete()
+        entries = [SurveyResponse(**p) for p in generate_payloads(30, seed=2)]
+        db.add_all(entries)
+        db.flush()
+        for entry in entries:
+            record_submission(db, entry)
+        db.commit()
+        live = dashboard_stats(db)
+
+        rebuild_counters(db)
+        assert dashboard_stats(db) == live
@@ -0,0 +1,14 @@
+from fastapi.testclient import TestClient
+
+import metrics
+import rate_limit
+from main import app
+
+
+def test_admission_rejections_are_labelled_with_their_path(monkeypatch):
+    monkeypatch.setattr(rate_limit.gate, "try_enter", lambda: False)
+    response = TestClient(app).post("/submit", json={})
+    assert response.status_code == 503
+    rendered = metrics.render()
+    assert 'http_requests_total{method="POST",path="/submit",status="503"}' in rendered
+    assert 'path="unmatched",status="503"' not in rendered
@@ -0,0 +1,28 @@
+from fastapi.testclient import TestClient
+
+from benchmarks.synthetic import SyntheticCatalog, generate_payloads
+from database import SessionLocal, engine
+from main import app
+from models import RecommendationResult
+from recommendation import invalidate_catalog
+from routes.results import RESULTS_CACHE
+
+
+def test_results_resolve_job_details_not_stored():
+    SyntheticCatalog(50).seed(engine)
+    invalidate_catalog()
+    client = TestClient(app)
+
+    submitted = client.post("/submit", json=generate_payloads(1, seed=7)[0]).json()
+    assert submitted["top_jobs"][0]["description"]
+
+    with SessionLocal() as db:
+        row = db.query(RecommendationResult).filter_by(survey_id=submitted["data_id"]).one()
+        assert set(row.top_jobs[0]) == {"soc_code", "title", "score", "components"}
+
+    RESULTS_CACHE.clear()
+    result = client.get(f"/results/{submitted['data_id']}").json()
+    assert result["top_jobs"] == submitted["top_jobs"]
+
+    compact = client.get(f"/results/{submitted['data_id']}?compact=true").json()
+    assert set(compact["top_jobs"][0]) == {"soc_code", "title", "score"}
@@ -0,0 +1,94 @@
+import copy
+import json
+import logging
+import os
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import SyntheticCatalog, generate_surveys
+from recommendation import _estimate_user_profile
+import scoring
+from scoring import (
+    DEFAULT_MAJORS, DEFAULT_WEIGHTS, Catalog, ScoringWeights, batch_scores, component_matrix,
+    load_majors, total_scores, validate_majors,
+)
+
+
+def test_batch_scores_match_component_matrix_under_other_weights():
+    synthetic = SyntheticCatalog(300, seed=3)
+    jobs = synthetic.job_objects()
+    for job in jobs[::7]:
+        job.focus_area = None
+        job.job_zone = None
+    catalog = Catalog(jobs, synthetic.skill_aggregates())
+    profiles = [_estimate_user_profile(s) for s in generate_surveys(40, seed=5)]
+
+    config = copy.deepcopy(DEFAULT_WEIGHTS)
+    config["components"]["remote"] = 0
+    config["riasec_blend"] = {"estimated": 0.5, "custom": 2.0}
+    config["aggregate_scale"] = 10
+    config["baseline"] = 1.5
+    weights_list = [ScoringWeights(DEFAULT_WEIGHTS), ScoringWeights(config)]
+
+    for weights, batch in zip(weights_list, batch_scores(catalog, profiles, weights_list)):
+        expected = np.array([total_scores(component_matrix(catalog, p, weights), weights) for p in profiles])
+        np.testing.assert_allclose(batch, expected, rtol=0, atol=1e-9)
+
+
+def test_bad_majors_file_keeps_previous_majors(tmp_path, caplog):
+    path = tmp_path / "majors.json"
+    good = {"top_k": 3, "majors": [{"name": "MS A", "soc_prefixes": ["15-1212"]}]}
+    path.write_text(json.dumps(good))
+    assert load_majors(path)["majors"][0]["name"] == "MS A"
+
+    for bad in ('{"majors": [],}', '{"top_k": 5}', '{"majors": [{"focus_areas": ["x"]}]}',
+                '{"majors": [{"name": "MS B", "soc_prefixes": "15-1212"}]}'):
+        path.write_text(bad)
+        with caplog.at_level(logging.ERROR, logger="scoring"):
+            assert load_majors(path)["majors"][0]["name"] == "MS A"
+        assert "could not load" in caplog.text
+        caplog.clear()
+
+    path.unlink()
+    assert load_majors(path) == validate_majors(DEFAULT_MAJORS)
+
+
+def test_catalog_rejects_string_soc_prefixes():
+    with pytest.raises(ValueError):
+        Catalog([], {}, {"majors": [{"name": "MS B", "soc_prefixes": "15-1212"}]})
+
+
+def _write_weights(path, config, stamp):
+    path.write_text(config if isinstance(config, str) else json.dumps(config))
+    # Distinct mtimes even when writes land within the filesystem's resolution
+    os.utime(path, ns=(stamp, stamp))
+
+
+def test_weights_hot_reload_keeps_previous_on_invalid_file(tmp_path, monkeypatch, caplog):
+    path = tmp_path / "scoring_weights.json"
+    monkeypatch.setattr(scoring, "SCORING_WEIGHTS_PATH", str(path))
+    monkeypatch.setattr(scoring, "_weights", ScoringWeights(DEFAULT_WEIGHTS))
+    monkeypatch.setattr(scoring, "_weights_stamp", None)
+    assert scoring.current_weights().version.startswith("builtin-")
+
+    config = {"version": "v2", "components": dict(DEFAULT_WEIGHTS["components"], remote=0.0)}
+    _write_weights(path, config, 1_000_000_000)
+    loaded = scoring.current_weights()
+    assert loaded.version.startswith("v2-")
+    assert loaded.vector[scoring.COMPONENTS.index("remote")] == 0.0
+    # Keys left out take the built-in values
+    assert loaded.baseline == DEFAULT_WEIGHTS["baseline"]
+    assert loaded.aggregate_scale == DEFAULT_WEIGHTS["aggregate_scale"]
+    assert loaded.riasec_estimated == DEFAULT_WEIGHTS["riasec_blend"]["estimated"]
+
+    for n, bad in enumerate(['{"components": {', {"components": {"remote": 1.0}},
+                             dict(config, aggregate_scale=0)]):
+        _write_weights(path, bad, 2_000_000_000 + n)
+        with caplog.at_level(logging.ERROR, logger="scoring"):
+            assert scoring.current_weights() is loaded
+        assert "Keeping scoring weights" in caplog.text
+        caplog.clear()
+
+    path.unlink()
+    assert scoring.current_weights().version.startswith("builtin-")
@@ -0,0 +1,101 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+import rate_limit
+from benchmarks.synthetic import SyntheticCatalog, generate_payloads
+from database import SessionLocal, engine
+from main import app
+from models import SurveyResponse
+from recommendation import invalidate_catalog
+from routes import survey
+
+
+@pytest.fixture(scope="module")
+def client():
+    SyntheticCatalog(50).seed(engine)
+    invalidate_catalog()
+    return TestClient(app)
+
+
+@pytest.fixture
+def answers():
+    return generate_payloads(2, seed=11)
+
+
+def _survey_count():
+    with SessionLocal() as db:
+        return db.query(SurveyResponse).count()
+
+
+def _submit(client, payload, key=None, **headers):
+    if key:
+        headers["Idempotency-Key"] = key
+    return client.post("/submit", json=payload, headers=headers)
+
+
+def test_repeated_key_is_replayed_from_memory(client, answers):
+    key = str(uuid.uuid4())
+    first = _submit(client, answers[0], key).json()
+    count = _survey_count()
+
+    again = _submit(client, answers[0], key)
+    assert again.status_code == 200
+    assert again.json() == first
+    assert _survey_count() == count
+
+
+def test_repeated_key_is_replayed_from_database_after_ttl(client, answers):
+    key = str(uuid.uuid4())
+    first = _submit(client, answers[0], key).json()
+    count = _survey_count()
+    survey._recent_submissions.clear()
+
+    again = _submit(client, answers[0], key)
+    assert again.status_code == 200
+    assert again.json() == first
+    assert _survey_count() == count
+
+
+def test_key_reused_with_different_answers_conflicts(client, answers):
+    key = str(uuid.uuid4())
+    _submit(client, answers[0], key)
+    assert _submit(client, answers[1], key).status_code == 409
+
+    survey._recent_submissions.clear()
+    assert _submit(client, answers[1], key).status_code == 409
+
+
+def test_concurrent_retry_falls_back_to_the_committed_row(client, answers, monkeypatch):
+    key = str(uuid.uuid4())
+    first = _submit(client, answers[0], key).json()
+    count = _survey_count()
+    survey._recent_submissions.clear()
+
+    # The first lookup misses, as if the other request had not committed yet,
+    # so the insert hits the unique constraint on idempotency_key
+    real_replay = survey._replay
+    calls = []
+
+    def racing_replay(*args):
+        calls.append(args)
+        return None if len(calls) == 1 else real_replay(*args)
+
+    monkeypatch.setattr(survey, "_replay", racing_replay)
+    again = _submit(client, answers[0], key)
+    assert again.status_code == 200
+    assert again.json() == first
+    assert len(calls) == 2
+    assert _survey_count() == count
+
+
+def test_keyless_duplicates_are_deduplicated_per_client(client, monkeypatch):
+    monkeypatch.setattr(rate_limit, "TRUST_FORWARDED_FOR", True)
+    payload = generate_payloads(1, seed=12)[0]
+    first = _submit(client, payload, **{"X-Forwarded-For": "203.0.113.1"}).json()
+    retry = _submit(client, payload, **{"X-Forwarded-For": "203.0.113.1, 10.0.0.1"}).json()
+    other = _submit(client, payload, **{"X-Forwarded-For": "203.0.113.2"}).json()
+
+    assert retry["data_id"] == first["data_id"]
+    assert other["data_id"] != first["data_id"]